@@ -3,7 +3,7 @@ FastAPI server for PAIS browser receiver.
 Receives page visit data from browser extension.
 """
 
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Optional
 from pathlib import Path
 
@@ -12,7 +12,7 @@ from pydantic import BaseModel
 from contextlib import asynccontextmanager
 
 from config.settings import get_settings
-from storage.database import Database
+from storage.database import get_default_db
 from collectors.browser_receiver import BrowserReceiver
 
 # Set up logging
@@ -27,7 +27,7 @@ logger = logging.getLogger(__name__)
 settings = get_settings()
 
 # Initialize database and receiver
-db = Database(settings.database.path)
+db = get_default_db()
 browser_receiver = BrowserReceiver()
 
 
@@ -177,18 +177,13 @@ async def get_stats(x_api_key: Optional[str] = Header(None)):
     
     try:
         # Get stats from database
-        since = datetime.now() - __import__("datetime").timedelta(days=1)
-        recent_events = db.get_events_since(since)
-        
-        unprocessed = db.get_unprocessed_events(limit=1000)
-        
-        # Count browser visits
-        recent_visits = len([e for e in recent_events if e.source == "browser"])
+        since = datetime.now() - timedelta(days=1)
+        counts = db.get_event_counts(since)
         
         return StatsResponse(
-            total_events=len(recent_events),
-            unprocessed_events=len(unprocessed),
-            recent_visits=recent_visits
+            total_events=counts["total"],
+            unprocessed_events=db.count_unprocessed_events(),
+            recent_visits=counts["by_source"].get("browser", 0)
         )
         
     except Exception as e:
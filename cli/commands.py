@@ -10,7 +10,7 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from config.settings import load_settings, get_settings
+from config.settings import load_settings, get_settings, write_json
 from storage.database import Database
 
 
@@ -238,14 +238,16 @@ def test_youtube(args):
             # Store in database if requested
             if args.store and result["sample_events"]:
                 db = Database(settings.database.path)
-                events_to_insert = []
-                for event in result["sample_events"]:
-                    events_to_insert.append((
+                now_iso = datetime.now().isoformat()
+                events_to_insert = [
+                    (
                         event.get("source", "youtube"),
                         event.get("event_type", "video_like"),
                         json.dumps(event.get("data", {})),
-                        event.get("timestamp", datetime.now().isoformat()),
-                    ))
+                        event.get("timestamp", now_iso),
+                    )
+                    for event in result["sample_events"]
+                ]
                 inserted = db.insert_events(events_to_insert)
                 print(f"\nStored {inserted} events to database")
 
@@ -505,12 +507,11 @@ def show_stats(args):
         
         # Event stats
         since = datetime.now() - timedelta(days=args.days)
-        events = db.get_events_since(since)
-        unprocessed = [e for e in events if not e.processed]
+        counts = db.get_event_counts(since)
         
         print(f"\nEvents:")
-        print(f"  Total: {len(events)}")
-        print(f"  Unprocessed: {len(unprocessed)}")
+        print(f"  Total: {counts['total']}")
+        print(f"  Unprocessed: {counts['unprocessed']}")
         
         return 0
         
@@ -565,8 +566,7 @@ def generate_logs(args):
                 ]
             }
             
-            with open(args.output, "w") as f:
-                json.dump(log_data, f, indent=2)
+            write_json(Path(args.output), log_data)
             print(f"Saved to: {args.output}")
         
         return 0
@@ -603,15 +603,13 @@ def weekly_synthesis(args):
         
         print(f"Analyzing activities from {start_date.date()} to {end_date.date()}")
         
+        # One query for the period, grouped by project
+        activities_by_project = db.get_activities_by_project(start=start_date, end=end_date)
+        
         # Process each active project
         project_count = 0
         for project_name in settings.projects.keys():
-            # Get activities for this project
-            activities = db.get_activities_for_period(
-                start=start_date,
-                end=end_date,
-                project_name=project_name,
-            )
+            activities = activities_by_project.get(project_name)
             
             if not activities:
                 print(f"  Skipping {project_name} - no activities")
@@ -620,11 +618,7 @@ def weekly_synthesis(args):
             print(f"\nProcessing {project_name} ({len(activities)} activities)...")
             
             # Read current README if exists
-            project_folder = obsidian_writer.ensure_project_folder(project_name)
-            readme_file = project_folder / "README.md"
-            current_readme = ""
-            if readme_file.exists():
-                current_readme = readme_file.read_text(encoding="utf-8")
+            current_readme = obsidian_writer.read_project_readme(project_name)
             
             # Generate weekly summary
             try:
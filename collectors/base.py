@@ -11,6 +11,25 @@ from pathlib import Path
 
 from config.settings import get_settings
 
+try:
+    from ciso8601 import parse_datetime as _parse_datetime
+except ImportError:  # Fall back to the standard library parser
+    _parse_datetime = None
+
+
+def parse_iso_datetime(value: str) -> datetime:
+    """
+    Parse an RFC 3339 timestamp as returned by Google APIs.
+    
+    Uses the ciso8601 C parser when installed. Accepts a trailing "Z".
+    
+    Raises:
+        ValueError: If the value is not a valid timestamp
+    """
+    if _parse_datetime is not None:
+        return _parse_datetime(value)
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
 
 class BaseCollector(ABC):
     """Abstract base class for all data collectors."""
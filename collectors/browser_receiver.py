@@ -8,16 +8,16 @@ from datetime import datetime
 from typing import Dict, Any, Optional
 
 from collectors.base import BaseCollector
-from storage.database import Database
+from storage.database import Database, get_default_db
 
 
 class BrowserReceiver(BaseCollector):
     """Receives and stores browser activity events."""
     
-    def __init__(self):
+    def __init__(self, db: Optional[Database] = None):
         """Initialize the browser receiver."""
         super().__init__("browser")
-        self.db = Database(self.settings.database.path)
+        self.db = db or get_default_db()
         self.logger.info("Initialized Browser receiver")
     
     def receive_page_visit(
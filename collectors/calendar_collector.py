@@ -3,19 +3,14 @@ Calendar data collector for PAIS.
 Fetches events from primary Google Calendar.
 """
 
-import os
 import json
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
-
-from collectors.base import BaseCollector
-from storage.database import Database
+from collectors.base import BaseCollector, parse_iso_datetime
+from collectors.google_auth import get_google_service
+from storage.database import Database, get_default_db
 
 # Calendar API scopes
 CALENDAR_SCOPES = ['https://www.googleapis.com/auth/calendar.readonly']
@@ -24,13 +19,13 @@ CALENDAR_SCOPES = ['https://www.googleapis.com/auth/calendar.readonly']
 class CalendarCollector(BaseCollector):
     """Collects calendar events from Google Calendar."""
     
-    def __init__(self, credentials_path: str):
+    def __init__(self, credentials_path: str, db: Optional[Database] = None):
         """Initialize with OAuth credentials path."""
         super().__init__("calendar")
         self.credentials_path = credentials_path
         self.token_path = self.settings.calendar.token_path
         self.service: Optional[Any] = None
-        self.db = Database(self.settings.database.path)
+        self.db = db or get_default_db()
         
         # Ensure config directory exists
         Path(self.token_path).parent.mkdir(parents=True, exist_ok=True)
@@ -45,46 +40,12 @@ class CalendarCollector(BaseCollector):
             self.logger.warning(f"Calendar credentials not found at: {credentials_path}")
     
     def _get_service(self) -> Any:
-        """Get or create Calendar API service with OAuth flow."""
-        creds = None
-        
-        # Load existing token if available
-        if os.path.exists(self.token_path):
-            try:
-                creds = Credentials.from_authorized_user_file(self.token_path, CALENDAR_SCOPES)
-                self.logger.info("Loaded existing Calendar token")
-            except Exception as e:
-                self.logger.warning(f"Failed to load token: {e}")
-        
-        # Refresh or create new credentials
-        if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
-                try:
-                    creds.refresh(Request())
-                    self.logger.info("Refreshed Calendar token")
-                except Exception as e:
-                    self.logger.error(f"Failed to refresh token: {e}")
-                    creds = None
-            
-            if not creds:
-                # Run OAuth flow
-                if not self.credentials_path or not Path(self.credentials_path).exists():
-                    raise FileNotFoundError(
-                        f"Credentials file not found: {self.credentials_path}"
-                    )
-                
-                flow = InstalledAppFlow.from_client_secrets_file(
-                    self.credentials_path, CALENDAR_SCOPES
-                )
-                creds = flow.run_local_server(port=0)
-                self.logger.info("Completed Calendar OAuth flow")
-            
-            # Save token for future runs
-            with open(self.token_path, 'w') as token:
-                token.write(creds.to_json())
-                self.logger.info(f"Saved Calendar token to {self.token_path}")
-        
-        return build('calendar', 'v3', credentials=creds, cache_discovery=False)
+        """Get the shared Calendar API service, running the OAuth flow if needed."""
+        service, _ = get_google_service(
+            "calendar", "v3", self.credentials_path, self.token_path,
+            CALENDAR_SCOPES, "Calendar", self.logger,
+        )
+        return service
     
     def _parse_event(self, event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Parse Calendar event into standardized format."""
@@ -98,12 +59,12 @@ class CalendarCollector(BaseCollector):
             end_time = None
             
             if "dateTime" in start:
-                start_time = datetime.fromisoformat(start["dateTime"].replace('Z', '+00:00'))
+                start_time = parse_iso_datetime(start["dateTime"])
             elif "date" in start:
                 start_time = datetime.strptime(start["date"], "%Y-%m-%d")
             
             if "dateTime" in end:
-                end_time = datetime.fromisoformat(end["dateTime"].replace('Z', '+00:00'))
+                end_time = parse_iso_datetime(end["dateTime"])
             elif "date" in end:
                 end_time = datetime.strptime(end["date"], "%Y-%m-%d")
             
@@ -132,7 +93,7 @@ class CalendarCollector(BaseCollector):
             )
             
         except Exception as e:
-            self.logger.warning(f"Error parsing calendar event: {e}")
+            self.logger.warning("Error parsing calendar event: %s", e)
             return None
     
     def collect(self, since: datetime) -> List[Dict[str, Any]]:
@@ -173,7 +134,7 @@ class CalendarCollector(BaseCollector):
                             if parsed:
                                 events.append(parsed)
                         except Exception as e:
-                            self.logger.warning(f"Error processing event: {e}")
+                            self.logger.warning("Error processing event: %s", e)
                             continue
                             
                 except Exception as e:
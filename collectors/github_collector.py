@@ -3,31 +3,62 @@ GitHub data collector for PAIS.
 Fetches commits and pull requests from accessible repositories.
 """
 
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
 from typing import List, Dict, Any, Optional
+import threading
 import time
 
 from github import Github
 from github.RateLimit import RateLimit
 
 from collectors.base import BaseCollector
-from storage.database import Database
+from config.settings import read_json, write_json
+from storage.database import Database, get_default_db
+
+# Persisted poll state, stored under the data directory
+POLL_STATE_FILE = "github_poll.json"
+GITHUB_PAGE_SIZE = 100  # GitHub's maximum per_page
+
+# token -> client, shared by every collector instance so its keep-alive
+# connections survive between collection cycles
+_CLIENT_CACHE: Dict[str, Github] = {}
+_CACHE_LOCK = threading.Lock()
+
+
+def _get_client(token: str, pool_size: int) -> Github:
+    """Get the cached PyGithub client for a token, creating it on first use."""
+    with _CACHE_LOCK:
+        client = _CLIENT_CACHE.get(token)
+        if client is None:
+            # PyGithub pages lazily and serially; the maximum page size
+            # turns most repo/commit/PR listings into a single request.
+            # The pool is sized for the per-repo worker threads.
+            client = _CLIENT_CACHE[token] = Github(
+                token,
+                per_page=GITHUB_PAGE_SIZE,
+                pool_size=max(1, pool_size),
+            )
+        return client
 
 
 class GitHubCollector(BaseCollector):
     """Collects GitHub activity (commits and PRs)."""
     
-    def __init__(self, token: str, username: str):
+    def __init__(self, token: str, username: str, db: Optional[Database] = None):
         """Initialize with PyGithub client."""
         super().__init__("github")
         self.token = token
         self.username = username
         self.github: Optional[Github] = None
-        self.db = Database(self.settings.database.path)
+        self.db = db or get_default_db()
+        self.poll_state_path = Path(self.settings.data_dir) / POLL_STATE_FILE
+        self.target_repos = frozenset(self.settings.github.repos)
         
         if token:
             try:
-                self.github = Github(token)
+                self.github = _get_client(token, self.settings.github.max_workers)
                 self.logger.info(f"Initialized GitHub collector for user: {username}")
             except Exception as e:
                 self.logger.error(f"Failed to initialize GitHub client: {e}")
@@ -40,12 +71,12 @@ class GitHubCollector(BaseCollector):
             return False
         
         try:
-            rate_limit = self.github.get_rate_limit()
-            core_limit = rate_limit.core
+            # PyGithub keeps the X-RateLimit-* headers of the last response, so
+            # this only costs a /rate_limit request before the first API call.
+            remaining, _ = self.github.rate_limiting
             
-            if core_limit.remaining < 10:
-                reset_time = core_limit.reset.timestamp()
-                wait_seconds = reset_time - time.time()
+            if remaining < 10:
+                wait_seconds = self.github.rate_limiting_resettime - time.time()
                 
                 if wait_seconds > 0:
                     self.logger.warning(
@@ -60,6 +91,38 @@ class GitHubCollector(BaseCollector):
             self.logger.error(f"Error checking rate limit: {e}")
             return True  # Proceed anyway, let the actual call fail if needed
     
+    def _recently_polled(self, since: datetime) -> bool:
+        """
+        Check whether a previous collection already covered this window.
+        
+        Returns True when the last successful collection started at or before
+        ``since`` and finished less than ``poll_interval_seconds`` ago, in which
+        case fetching again would only return the same events.
+        """
+        try:
+            state = read_json(self.poll_state_path)
+        except (OSError, ValueError):
+            return False
+        
+        last_fetch = state.get("last_fetch", 0)
+        last_since = state.get("last_since")
+        if last_since is None or since.timestamp() < last_since:
+            return False
+        
+        return time.time() - last_fetch < self.settings.github.poll_interval_seconds
+    
+    def _save_poll_state(self, since: datetime) -> None:
+        """Record a successful collection so rapid re-polls can be skipped."""
+        state = {
+            "last_fetch": time.time(),
+            "last_since": since.timestamp(),
+        }
+        try:
+            self.poll_state_path.parent.mkdir(parents=True, exist_ok=True)
+            write_json(self.poll_state_path, state)
+        except OSError as e:
+            self.logger.warning(f"Failed to save GitHub poll state: {e}")
+    
     def _get_user_repos(self) -> List[Any]:
         """Get all repositories accessible to the user."""
         if not self.github:
@@ -89,6 +152,7 @@ class GitHubCollector(BaseCollector):
     def _fetch_commits(self, repo: Any, since: datetime) -> List[Dict[str, Any]]:
         """Fetch commits from a repository since the given date."""
         commits = []
+        repo_name = repo.full_name
         
         try:
             if not self._check_rate_limit():
@@ -115,7 +179,7 @@ class GitHubCollector(BaseCollector):
                         timestamp=commit_time,
                         event_type="commit",
                         data={
-                            "repo": repo.full_name,
+                            "repo": repo_name,
                             "branch": commit_data.message.split("\n")[0][:50],
                             "message": commit_data.message,
                             "sha": commit.sha[:7],
@@ -125,17 +189,19 @@ class GitHubCollector(BaseCollector):
                     commits.append(event)
                     
                 except Exception as e:
-                    self.logger.warning(f"Error processing commit: {e}")
+                    self.logger.warning("Error processing commit: %s", e)
                     continue
                     
         except Exception as e:
-            self.logger.error(f"Error fetching commits from {repo.full_name}: {e}")
+            self.logger.error(f"Error fetching commits from {repo_name}: {e}")
         
         return commits
     
     def _fetch_prs(self, repo: Any, since: datetime) -> List[Dict[str, Any]]:
         """Fetch pull requests from a repository since the given date."""
         prs = []
+        repo_name = repo.full_name
+        username = self.username
         
         try:
             if not self._check_rate_limit():
@@ -147,7 +213,7 @@ class GitHubCollector(BaseCollector):
                     break
                 
                 # Check if PR is by the user and within time range
-                if pr.user.login != self.username:
+                if pr.user.login != username:
                     continue
                 
                 pr_time = pr.created_at
@@ -159,7 +225,7 @@ class GitHubCollector(BaseCollector):
                         timestamp=pr_time,
                         event_type="pr",
                         data={
-                            "repo": repo.full_name,
+                            "repo": repo_name,
                             "branch": pr.head.ref,
                             "message": pr.title,
                             "sha": f"PR#{pr.number}",
@@ -169,14 +235,33 @@ class GitHubCollector(BaseCollector):
                     prs.append(event)
                     
                 except Exception as e:
-                    self.logger.warning(f"Error processing PR: {e}")
+                    self.logger.warning("Error processing PR: %s", e)
                     continue
                     
         except Exception as e:
-            self.logger.error(f"Error fetching PRs from {repo.full_name}: {e}")
+            self.logger.error(f"Error fetching PRs from {repo_name}: {e}")
         
         return prs
     
+    def _collect_repo(self, repo: Any, since: datetime) -> List[Dict[str, Any]]:
+        """Fetch the enabled event types (commits, PRs) for a single repository."""
+        events = []
+        self.logger.info(f"Processing repository: {repo.full_name}")
+        
+        # Fetch commits if enabled
+        if self.settings.github.fetch_commits:
+            commits = self._fetch_commits(repo, since)
+            events.extend(commits)
+            self.logger.info(f"Found {len(commits)} commits in {repo.full_name}")
+        
+        # Fetch PRs if enabled
+        if self.settings.github.fetch_prs:
+            prs = self._fetch_prs(repo, since)
+            events.extend(prs)
+            self.logger.info(f"Found {len(prs)} PRs in {repo.full_name}")
+        
+        return events
+    
     def collect(self, since: datetime) -> List[Dict[str, Any]]:
         """Collect commits and PRs from all accessible repositories."""
         events = []
@@ -185,32 +270,32 @@ class GitHubCollector(BaseCollector):
             self.logger.error("GitHub client not initialized")
             return events
         
+        if self._recently_polled(since):
+            self.logger.info(
+                f"Skipping GitHub collection: window already polled within the last "
+                f"{self.settings.github.poll_interval_seconds}s"
+            )
+            return events
+        
         self.logger.info(f"Starting GitHub collection since {since.isoformat()}")
         
         repos = self._get_user_repos()
         self.logger.info(f"Found {len(repos)} accessible repositories")
         
         # Filter repos if specific repos are configured
-        target_repos = self.settings.github.repos
-        if target_repos:
-            repos = [r for r in repos if r.full_name in target_repos]
+        if self.target_repos:
+            repos = [r for r in repos if r.full_name in self.target_repos]
             self.logger.info(f"Filtered to {len(repos)} configured repositories")
         
-        for repo in repos:
-            self.logger.info(f"Processing repository: {repo.full_name}")
-            
-            # Fetch commits if enabled
-            if self.settings.github.fetch_commits:
-                commits = self._fetch_commits(repo, since)
-                events.extend(commits)
-                self.logger.info(f"Found {len(commits)} commits in {repo.full_name}")
-            
-            # Fetch PRs if enabled
-            if self.settings.github.fetch_prs:
-                prs = self._fetch_prs(repo, since)
-                events.extend(prs)
-                self.logger.info(f"Found {len(prs)} PRs in {repo.full_name}")
+        if repos:
+            # Repositories are independent, so fetch them concurrently; PyGithub
+            # is blocking and spends nearly all of its time waiting on HTTP.
+            max_workers = max(1, min(self.settings.github.max_workers, len(repos)))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for repo_events in executor.map(lambda r: self._collect_repo(r, since), repos):
+                    events.extend(repo_events)
         
+        self._save_poll_state(since)
         self.logger.info(f"GitHub collection complete. Total events: {len(events)}")
         return events
     
@@ -228,7 +313,7 @@ class GitHubCollector(BaseCollector):
         
         try:
             # Get recent activity (last 7 days)
-            since = datetime.now() - __import__("datetime").timedelta(days=7)
+            since = datetime.now() - timedelta(days=7)
             sample_events = self.collect(since)
             
             # Limit to first 5 events
@@ -3,35 +3,48 @@ Gmail data collector for PAIS.
 Fetches emails from priority inbox using Gmail API.
 """
 
-import os
-import json
 import base64
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
 
 from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 
 from collectors.base import BaseCollector
-from storage.database import Database
+from collectors.google_auth import get_google_service, get_thread_http
+from config.settings import read_json, write_json
+from storage.database import Database, get_default_db
 
 # Gmail API scopes
 GMAIL_SCOPES = ['https://www.googleapis.com/auth/gmail.readonly']
 
+HISTORY_STATE_FILE = "gmail_history.json"
+
+# Gmail accepts up to 100 calls per batch but recommends 50 to avoid rate limiting
+BATCH_SIZE = 50
+MAX_BATCH_RETRIES = 3
+
+# Only the parts of a message that _parse_email reads
+MESSAGE_HEADERS = ['Subject', 'From', 'To']
+MESSAGE_FIELDS = 'id,internalDate,snippet,labelIds,threadId,payload/headers'
+
 
 class GmailCollector(BaseCollector):
     """Collects Gmail activity (emails)."""
     
-    def __init__(self, credentials_path: str):
+    def __init__(self, credentials_path: str, db: Optional[Database] = None):
         """Initialize with OAuth credentials path."""
         super().__init__("gmail")
         self.credentials_path = credentials_path
         self.token_path = self.settings.gmail.token_path
         self.service: Optional[Any] = None
-        self.db = Database(self.settings.database.path)
+        self.creds: Optional[Credentials] = None
+        self.db = db or get_default_db()
+        self.history_state_path = Path(self.settings.data_dir) / HISTORY_STATE_FILE
         
         # Ensure config directory exists
         Path(self.token_path).parent.mkdir(parents=True, exist_ok=True)
@@ -46,67 +59,27 @@ class GmailCollector(BaseCollector):
             self.logger.warning(f"Gmail credentials not found at: {credentials_path}")
     
     def _get_service(self) -> Any:
-        """Get or create Gmail API service with OAuth flow."""
-        creds = None
-        
-        # Load existing token if available
-        if os.path.exists(self.token_path):
-            try:
-                creds = Credentials.from_authorized_user_file(self.token_path, GMAIL_SCOPES)
-                self.logger.info("Loaded existing Gmail token")
-            except Exception as e:
-                self.logger.warning(f"Failed to load token: {e}")
-        
-        # Refresh or create new credentials
-        if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
-                try:
-                    creds.refresh(Request())
-                    self.logger.info("Refreshed Gmail token")
-                except Exception as e:
-                    self.logger.error(f"Failed to refresh token: {e}")
-                    creds = None
-            
-            if not creds:
-                # Run OAuth flow
-                if not self.credentials_path or not Path(self.credentials_path).exists():
-                    raise FileNotFoundError(
-                        f"Credentials file not found: {self.credentials_path}"
-                    )
-                
-                flow = InstalledAppFlow.from_client_secrets_file(
-                    self.credentials_path, GMAIL_SCOPES
-                )
-                creds = flow.run_local_server(port=0)
-                self.logger.info("Completed Gmail OAuth flow")
-            
-            # Save token for future runs
-            with open(self.token_path, 'w') as token:
-                token.write(creds.to_json())
-                self.logger.info(f"Saved Gmail token to {self.token_path}")
-        
-        return build('gmail', 'v1', credentials=creds, cache_discovery=False)
+        """Get the shared Gmail API service, running the OAuth flow if needed."""
+        service, creds = get_google_service(
+            "gmail", "v1", self.credentials_path, self.token_path,
+            GMAIL_SCOPES, "Gmail", self.logger,
+        )
+        self.creds = creds
+        return service
     
     def _parse_email(self, message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Parse Gmail message into standardized event format."""
         try:
             headers = message.get("payload", {}).get("headers", [])
             
-            # Extract headers
-            subject = ""
-            from_addr = ""
-            to_addr = ""
-            
-            for header in headers:
-                name = header.get("name", "").lower()
-                value = header.get("value", "")
-                
-                if name == "subject":
-                    subject = value
-                elif name == "from":
-                    from_addr = value
-                elif name == "to":
-                    to_addr = value
+            # Extract headers (names are case-insensitive)
+            header_values = {
+                header.get("name", "").lower(): header.get("value", "")
+                for header in headers
+            }
+            subject = header_values.get("subject", "")
+            from_addr = header_values.get("from", "")
+            to_addr = header_values.get("to", "")
             
             # Get internal date
             internal_date = message.get("internalDate")
@@ -128,6 +101,7 @@ class GmailCollector(BaseCollector):
                 timestamp=timestamp,
                 event_type="email",
                 data={
+                    "message_id": message.get("id", ""),
                     "subject": subject,
                     "from": from_addr,
                     "to": to_addr,
@@ -138,8 +112,183 @@ class GmailCollector(BaseCollector):
             )
             
         except Exception as e:
-            self.logger.warning(f"Error parsing email: {e}")
+            self.logger.warning("Error parsing email: %s", e)
+            return None
+    
+    def _fetch_messages(self, message_ids: List[str]) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """Fetch full messages through the batch endpoint, preserving order.
+        
+        Requests are grouped into batches of BATCH_SIZE. Individual calls
+        rejected with 429 are retried in a smaller follow-up batch with
+        exponential backoff instead of re-sending the whole batch.
+        
+        Returns:
+            Tuple of (fetched messages, IDs that could not be fetched and
+            should be retried). Messages deleted since they were listed
+            (404) are not retried.
+        """
+        messages: Dict[str, Dict[str, Any]] = {}
+        failed: List[str] = []
+        
+        def on_message(request_id: str, response: Any, exception: Optional[Exception]):
+            if exception is None:
+                messages[request_id] = response
+            elif isinstance(exception, HttpError) and exception.resp.status == 429:
+                throttled.append(request_id)
+            else:
+                self.logger.warning("Error fetching message %s: %s", request_id, exception)
+                if not (isinstance(exception, HttpError) and exception.resp.status == 404):
+                    failed.append(request_id)
+        
+        id_iter = iter(message_ids)
+        while chunk := list(islice(id_iter, BATCH_SIZE)):
+            for attempt in range(MAX_BATCH_RETRIES + 1):
+                throttled: List[str] = []
+                batch = self.service.new_batch_http_request(callback=on_message)
+                for message_id in chunk:
+                    batch.add(
+                        self.service.users().messages().get(
+                            userId='me',
+                            id=message_id,
+                            format='metadata',
+                            metadataHeaders=MESSAGE_HEADERS,
+                            fields=MESSAGE_FIELDS,
+                        ),
+                        request_id=message_id,
+                    )
+                batch.execute()
+                
+                if not throttled:
+                    break
+                if attempt == MAX_BATCH_RETRIES:
+                    self.logger.warning(f"Deferring {len(throttled)} rate-limited messages to the next run")
+                    failed.extend(throttled)
+                    break
+                chunk = throttled
+                time.sleep(2 ** attempt)
+        
+        return [messages[mid] for mid in message_ids if mid in messages], failed
+    
+    def _list_label(self, label: str, query: str) -> List[str]:
+        """List message IDs matching the query in one label.
+        
+        Runs on a worker thread, so it uses the thread's own HTTP connection:
+        the httplib2 client shared by the service is not thread-safe.
+        """
+        self.logger.info(f"Querying label: {label}")
+        
+        try:
+            http = get_thread_http(self.creds)
+            message_ids = []
+            page_token = None
+            
+            while True:
+                results = self.service.users().messages().list(
+                    userId='me',
+                    labelIds=[label],
+                    q=query,
+                    maxResults=self.settings.gmail.page_size,
+                    pageToken=page_token,
+                    fields='messages/id,nextPageToken'
+                ).execute(http=http)
+                
+                message_ids.extend(m['id'] for m in results.get('messages', []))
+                page_token = results.get('nextPageToken')
+                if not page_token or not self.settings.gmail.paginate:
+                    break
+            
+            self.logger.info(f"Found {len(message_ids)} messages in {label}")
+            return message_ids
+            
+        except Exception as e:
+            self.logger.error(f"Error querying label {label}: {e}")
+            return []
+    
+    def _load_history_state(self) -> Optional[Dict[str, Any]]:
+        """Load the historyId, window start and pending IDs recorded by the last sync."""
+        try:
+            state = read_json(self.history_state_path)
+        except (OSError, ValueError):
             return None
+        
+        if not state.get("history_id") or state.get("since") is None:
+            return None
+        return state
+    
+    def _save_history_state(self, history_id: str, covered_since: float, pending_ids: List[str]) -> None:
+        """
+        Record the mailbox historyId so the next run can sync incrementally.
+        
+        Messages listed before history_id but not fetched are recorded as
+        pending_ids; history replay from history_id would never list them again.
+        """
+        state = {
+            "history_id": history_id,
+            "since": covered_since,
+            "pending_ids": pending_ids,
+        }
+        try:
+            self.history_state_path.parent.mkdir(parents=True, exist_ok=True)
+            write_json(self.history_state_path, state)
+        except OSError as e:
+            self.logger.warning(f"Failed to save Gmail history state: {e}")
+    
+    def _list_history(self, start_history_id: str) -> Optional[List[str]]:
+        """
+        List IDs of messages added to the configured labels since a historyId.
+        
+        Returns None when the historyId is too old for Gmail to replay (404),
+        in which case the caller falls back to a full query.
+        """
+        labels = set(self.settings.gmail.labels)
+        message_ids: Dict[str, None] = {}
+        page_token = None
+        
+        try:
+            while True:
+                results = self.service.users().history().list(
+                    userId='me',
+                    startHistoryId=start_history_id,
+                    historyTypes=['messageAdded'],
+                    pageToken=page_token,
+                    fields='history/messagesAdded/message(id,labelIds),nextPageToken'
+                ).execute()
+                
+                for record in results.get('history', []):
+                    for added in record.get('messagesAdded', []):
+                        message = added.get('message', {})
+                        if labels.intersection(message.get('labelIds', [])):
+                            message_ids[message['id']] = None
+                
+                page_token = results.get('nextPageToken')
+                if not page_token:
+                    break
+        
+        except HttpError as e:
+            if e.resp.status == 404:
+                self.logger.info("Gmail history ID expired, falling back to full query")
+                return None
+            raise
+        
+        self.logger.info(f"Found {len(message_ids)} new messages since last sync")
+        return list(message_ids)
+    
+    def _list_since(self, since: datetime) -> List[str]:
+        """List IDs of messages in the configured labels since a date."""
+        # Build query for date range; epoch seconds keep the window exact
+        # where a YYYY/MM/DD date would match the whole day
+        query = f"after:{int(since.timestamp())}"
+        
+        # Label queries are independent, so run them concurrently
+        labels = self.settings.gmail.labels
+        message_ids: Dict[str, None] = {}
+        if labels:
+            with ThreadPoolExecutor(max_workers=len(labels)) as executor:
+                for label_ids in executor.map(lambda l: self._list_label(l, query), labels):
+                    # A message can carry several labels (e.g. sent to self)
+                    message_ids.update(dict.fromkeys(label_ids))
+        
+        return list(message_ids)
     
     def collect(self, since: datetime) -> List[Dict[str, Any]]:
         """Collect emails from priority inbox since the given date."""
@@ -152,44 +301,45 @@ class GmailCollector(BaseCollector):
         self.logger.info(f"Starting Gmail collection since {since.isoformat()}")
         
         try:
-            # Build query for date range
-            since_str = since.strftime("%Y/%m/%d")
-            query = f"after:{since_str}"
+            # Read the mailbox position before listing so nothing added
+            # during this run is missed by the next incremental sync
+            history_id = self.service.users().getProfile(
+                userId='me', fields='historyId'
+            ).execute().get('historyId')
             
-            # Query for each configured label
-            for label in self.settings.gmail.labels:
-                self.logger.info(f"Querying label: {label}")
-                
-                try:
-                    results = self.service.users().messages().list(
-                        userId='me',
-                        labelIds=[label],
-                        q=query,
-                        maxResults=100
-                    ).execute()
-                    
-                    messages = results.get('messages', [])
-                    self.logger.info(f"Found {len(messages)} messages in {label}")
-                    
-                    for msg_meta in messages:
-                        try:
-                            # Get full message details
-                            msg = self.service.users().messages().get(
-                                userId='me',
-                                id=msg_meta['id']
-                            ).execute()
-                            
-                            event = self._parse_email(msg)
-                            if event:
-                                events.append(event)
-                                
-                        except Exception as e:
-                            self.logger.warning(f"Error fetching message {msg_meta['id']}: {e}")
-                            continue
-                            
-                except Exception as e:
-                    self.logger.error(f"Error querying label {label}: {e}")
-                    continue
+            # Replay only what changed if the last sync covered this window
+            message_ids: Optional[List[str]] = None
+            covered_since = since.timestamp()
+            state = self._load_history_state()
+            if state and covered_since >= state["since"]:
+                message_ids = self._list_history(state["history_id"])
+                if message_ids is not None:
+                    covered_since = state["since"]
+            
+            if message_ids is None:
+                message_ids = self._list_since(since)
+            
+            # Retry messages the last run listed but failed to fetch
+            pending_ids = state.get("pending_ids", []) if state else []
+            if pending_ids:
+                self.logger.info(f"Retrying {len(pending_ids)} messages from the last run")
+                message_ids = list(dict.fromkeys(pending_ids + message_ids))
+            
+            # Skip messages already stored by an earlier run
+            known_ids = self.db.get_known_external_ids("gmail", message_ids)
+            new_ids = [mid for mid in message_ids if mid not in known_ids]
+            if known_ids:
+                self.logger.info(f"Skipping {len(known_ids)} already collected messages")
+            
+            # Get full message details in batches rather than one call each
+            messages, failed_ids = self._fetch_messages(new_ids)
+            for msg in messages:
+                event = self._parse_email(msg)
+                if event:
+                    events.append(event)
+            
+            if history_id:
+                self._save_history_state(history_id, covered_since, failed_ids)
         
         except Exception as e:
             self.logger.error(f"Error collecting Gmail data: {e}")
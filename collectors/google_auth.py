@@ -0,0 +1,238 @@
+"""
+Shared Google OAuth handling for PAIS collectors.
+Caches credentials and built API services across collector instances.
+"""
+
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import httplib2
+from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp
+from google_auth_oauthlib.flow import InstalledAppFlow
+from google.auth.transport.requests import Request
+from googleapiclient.discovery import build
+from googleapiclient.model import JsonModel
+
+try:
+    import orjson
+except ImportError:  # Fall back to the stock JSON model
+    orjson = None
+
+
+# (api, version, credentials_path, token_path, scopes) -> (service, creds)
+_SERVICE_CACHE: Dict[Tuple, Tuple[Any, Credentials]] = {}
+_CACHE_LOCK = threading.Lock()
+
+# id(creds) -> lock serializing refreshes of those credentials, so a slow
+# token endpoint never holds up the cache (or other APIs' credentials)
+_REFRESH_LOCKS: Dict[int, threading.Lock] = {}
+
+# Per-thread authorized connections; httplib2.Http is not thread-safe
+_THREAD_HTTP = threading.local()
+
+HTTP_TIMEOUT_SECONDS = 30
+
+# Refresh tokens this long before they expire, off the request path
+REFRESH_AHEAD = timedelta(minutes=5)
+
+# Backoff between failed background refreshes
+REFRESH_RETRY_SECONDS = 30
+REFRESH_RETRY_MAX_SECONDS = 600
+
+
+class OrjsonModel(JsonModel):
+    """JsonModel that decodes response bodies with orjson."""
+
+    def deserialize(self, content):
+        try:
+            body = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            # Not JSON (e.g. an empty body); let the stock model handle it
+            return super().deserialize(content)
+        if self._data_wrapper and isinstance(body, dict) and "data" in body:
+            body = body["data"]
+        return body
+
+
+def _authorized_http(creds: Credentials) -> AuthorizedHttp:
+    """Create an authorized keep-alive connection with a request timeout."""
+    return AuthorizedHttp(creds, http=httplib2.Http(timeout=HTTP_TIMEOUT_SECONDS))
+
+
+def get_thread_http(creds: Credentials) -> AuthorizedHttp:
+    """
+    Get this thread's authorized HTTP client for the given credentials.
+
+    Pass the result to request.execute(http=...) when a shared service is
+    used from worker threads. The connection is kept open and reused by
+    every request the thread makes with the same credentials.
+    """
+    pool = getattr(_THREAD_HTTP, "pool", None)
+    if pool is None:
+        pool = _THREAD_HTTP.pool = {}
+    http = pool.get(id(creds))
+    if http is None:
+        http = pool[id(creds)] = _authorized_http(creds)
+    return http
+
+
+def _save_token(creds: Credentials, token_path: str, display_name: str, logger: logging.Logger):
+    """Persist credentials so the next process can skip the OAuth flow."""
+    with open(token_path, "w") as token:
+        token.write(creds.to_json())
+        logger.info(f"Saved {display_name} token to {token_path}")
+
+
+def _utcnow() -> datetime:
+    """Get the current time as a naive UTC datetime, as google-auth keeps expiry."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _refresh_ahead(creds: Credentials, token_path: str, display_name: str, logger: logging.Logger):
+    """
+    Keep credentials fresh, refreshing each token shortly before it expires.
+
+    Runs in a daemon thread. The credentials object is refreshed in place,
+    so cached services and per-thread connections see the new token. Failed
+    refreshes are retried with exponential backoff; until one succeeds,
+    requests fall back to refreshing lazily.
+    """
+    retry_delay = REFRESH_RETRY_SECONDS
+    while creds.expiry and creds.refresh_token:
+        delay = (creds.expiry - REFRESH_AHEAD - _utcnow()).total_seconds()
+        if delay > 0:
+            time.sleep(delay)
+        try:
+            with _REFRESH_LOCKS[id(creds)]:
+                # Skip if a lazy refresh already renewed the token while we slept
+                if creds.expiry - REFRESH_AHEAD <= _utcnow():
+                    creds.refresh(Request())
+                    logger.info(f"Refreshed {display_name} token ahead of expiry")
+                    _save_token(creds, token_path, display_name, logger)
+            retry_delay = REFRESH_RETRY_SECONDS
+        except Exception as e:
+            logger.warning(
+                f"Background {display_name} token refresh failed, retrying in {retry_delay}s: {e}"
+            )
+            time.sleep(retry_delay)
+            retry_delay = min(retry_delay * 2, REFRESH_RETRY_MAX_SECONDS)
+
+
+def _start_refresh_thread(creds: Credentials, token_path: str, display_name: str, logger: logging.Logger):
+    """Start refreshing credentials in the background."""
+    threading.Thread(
+        target=_refresh_ahead,
+        args=(creds, token_path, display_name, logger),
+        name=f"{display_name}-token-refresh",
+        daemon=True,
+    ).start()
+
+
+def _load_credentials(
+    credentials_path: str,
+    token_path: str,
+    scopes: List[str],
+    display_name: str,
+    logger: logging.Logger,
+) -> Credentials:
+    """Load, refresh or create credentials with the OAuth flow."""
+    creds = None
+
+    # Load existing token if available
+    if os.path.exists(token_path):
+        try:
+            creds = Credentials.from_authorized_user_file(token_path, scopes)
+            logger.info(f"Loaded existing {display_name} token")
+        except Exception as e:
+            logger.warning(f"Failed to load token: {e}")
+
+    # Refresh or create new credentials
+    if not creds or not creds.valid:
+        if creds and creds.expired and creds.refresh_token:
+            try:
+                creds.refresh(Request())
+                logger.info(f"Refreshed {display_name} token")
+            except Exception as e:
+                logger.error(f"Failed to refresh token: {e}")
+                creds = None
+
+        if not creds:
+            # Run OAuth flow
+            if not credentials_path or not Path(credentials_path).exists():
+                raise FileNotFoundError(f"Credentials file not found: {credentials_path}")
+
+            flow = InstalledAppFlow.from_client_secrets_file(credentials_path, scopes)
+            creds = flow.run_local_server(port=0)
+            logger.info(f"Completed {display_name} OAuth flow")
+
+        # Save token for future runs
+        _save_token(creds, token_path, display_name, logger)
+
+    return creds
+
+
+def get_google_service(
+    api: str,
+    version: str,
+    credentials_path: str,
+    token_path: str,
+    scopes: List[str],
+    display_name: str,
+    logger: logging.Logger,
+) -> Tuple[Any, Credentials]:
+    """
+    Get a cached Google API service, building it on first use.
+
+    The built service holds a reference to the credentials object, so
+    expired credentials are refreshed in place rather than rebuilding the
+    service and re-parsing its discovery document. A background thread
+    refreshes them shortly before they expire, so requests don't wait on
+    the refresh.
+
+    Args:
+        api: Google API name, e.g. "gmail"
+        version: API version, e.g. "v1"
+        credentials_path: OAuth client secrets file
+        token_path: Where the authorized user token is stored
+        scopes: OAuth scopes to request
+        display_name: Name used in log messages
+        logger: Logger of the calling collector
+
+    Returns:
+        Tuple of (service, credentials)
+    """
+    key = (api, version, credentials_path, token_path, tuple(scopes))
+
+    with _CACHE_LOCK:
+        cached = _SERVICE_CACHE.get(key)
+        if not cached:
+            creds = _load_credentials(credentials_path, token_path, scopes, display_name, logger)
+            # One keep-alive connection per service, shared by all of its calls
+            service = build(
+                api,
+                version,
+                http=_authorized_http(creds),
+                model=OrjsonModel() if orjson else None,
+                cache_discovery=False,
+            )
+            _SERVICE_CACHE[key] = (service, creds)
+            _REFRESH_LOCKS[id(creds)] = threading.Lock()
+            _start_refresh_thread(creds, token_path, display_name, logger)
+            return service, creds
+
+    # Refresh outside the cache lock so other APIs' lookups aren't held up
+    service, creds = cached
+    if creds.expired and creds.refresh_token:
+        with _REFRESH_LOCKS[id(creds)]:
+            # The background refresher may have got there first
+            if creds.expired:
+                creds.refresh(Request())
+                logger.info(f"Refreshed {display_name} token")
+                _save_token(creds, token_path, display_name, logger)
+    return service, creds
@@ -3,32 +3,44 @@ YouTube data collector for PAIS.
 Fetches liked videos from YouTube, filtering out Shorts.
 """
 
-import os
-from datetime import datetime, timedelta
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 
 from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
 
-from collectors.base import BaseCollector
+from collectors.base import BaseCollector, parse_iso_datetime
+from collectors.google_auth import get_google_service, get_thread_http
+from storage.database import Database, get_default_db
 
 # YouTube API scopes
 YOUTUBE_SCOPES = ["https://www.googleapis.com/auth/youtube.readonly"]
 
+# Partial-response selectors covering only the fields the parser reads
+PLAYLIST_ITEM_FIELDS = (
+    "items(snippet(publishedAt,title,channelTitle,channelId,description),"
+    "contentDetails/videoId),nextPageToken"
+)
+VIDEO_DURATION_FIELDS = "items(id,contentDetails/duration)"
+
+# ISO 8601 video duration, e.g. PT1H2M3S
+DURATION_PATTERN = re.compile(r"PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?")
+
 
 class YouTubeCollector(BaseCollector):
     """Collects liked videos from YouTube, excluding Shorts."""
 
-    def __init__(self, credentials_path: str):
+    def __init__(self, credentials_path: str, db: Optional[Database] = None):
         """Initialize with OAuth credentials path."""
         super().__init__("youtube")
         self.credentials_path = credentials_path
         self.token_path = self.settings.youtube.token_path
         self.service: Optional[Any] = None
+        self.creds: Optional[Credentials] = None
         self.min_duration_seconds = self.settings.youtube.min_duration_seconds
+        self.db = db or get_default_db()
 
         # Ensure config directory exists
         Path(self.token_path).parent.mkdir(parents=True, exist_ok=True)
@@ -43,83 +55,50 @@ class YouTubeCollector(BaseCollector):
             self.logger.warning(f"YouTube credentials not found at: {credentials_path}")
 
     def _get_service(self) -> Any:
-        """Get or create YouTube API service with OAuth flow."""
-        creds = None
-
-        # Load existing token if available
-        if os.path.exists(self.token_path):
-            try:
-                creds = Credentials.from_authorized_user_file(self.token_path, YOUTUBE_SCOPES)
-                self.logger.info("Loaded existing YouTube token")
-            except Exception as e:
-                self.logger.warning(f"Failed to load token: {e}")
-
-        # Refresh or create new credentials
-        if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
-                try:
-                    creds.refresh(Request())
-                    self.logger.info("Refreshed YouTube token")
-                except Exception as e:
-                    self.logger.error(f"Failed to refresh token: {e}")
-                    creds = None
-
-            if not creds:
-                # Run OAuth flow
-                if not self.credentials_path or not Path(self.credentials_path).exists():
-                    raise FileNotFoundError(
-                        f"Credentials file not found: {self.credentials_path}"
-                    )
-
-                flow = InstalledAppFlow.from_client_secrets_file(
-                    self.credentials_path, YOUTUBE_SCOPES
-                )
-                creds = flow.run_local_server(port=0)
-                self.logger.info("Completed YouTube OAuth flow")
+        """Get the shared YouTube API service, running the OAuth flow if needed."""
+        service, self.creds = get_google_service(
+            "youtube", "v3", self.credentials_path, self.token_path,
+            YOUTUBE_SCOPES, "YouTube", self.logger,
+        )
+        return service
+
+    def _get_durations(self, video_ids: List[str]) -> Dict[str, int]:
+        """Look up durations in seconds for up to 50 videos in one call."""
+        # With the Shorts filter disabled the durations would go unused
+        if not video_ids or self.min_duration_seconds <= 0:
+            return {}
 
-            # Save token for future runs
-            with open(self.token_path, "w") as token:
-                token.write(creds.to_json())
-                self.logger.info(f"Saved YouTube token to {self.token_path}")
-
-        return build("youtube", "v3", credentials=creds, cache_discovery=False)
-
-    def _is_short(self, video_id: str) -> bool:
-        """Check if a video is a Short by examining its details."""
         try:
             video_response = (
                 self.service.videos()
-                .list(part="contentDetails,snippet", id=video_id)
+                .list(
+                    part="contentDetails",
+                    id=",".join(video_ids),
+                    maxResults=len(video_ids),
+                    fields=VIDEO_DURATION_FIELDS,
+                )
                 .execute()
             )
 
-            if not video_response.get("items"):
-                return False
-
-            video = video_response["items"][0]
-            content_details = video.get("contentDetails", {})
-            duration = content_details.get("duration", "")
-
             # Parse ISO 8601 duration
             # PT1M30S = 1 minute 30 seconds
             # PT30S = 30 seconds
-            duration_seconds = self._parse_duration(duration)
-
-            return duration_seconds <= self.min_duration_seconds
+            return {
+                video["id"]: self._parse_duration(video.get("contentDetails", {}).get("duration", ""))
+                for video in video_response.get("items", [])
+            }
 
         except Exception as e:
-            self.logger.warning(f"Error checking if video {video_id} is a Short: {e}")
-            return False
+            self.logger.warning(f"Error looking up durations for {len(video_ids)} videos: {e}")
+            return {}
 
     def _parse_duration(self, duration: str) -> int:
         """Parse ISO 8601 duration string to seconds."""
-        import re
-
         if not duration:
             return 0
 
         # Match PT#H#M#S format
-        match = re.match(r"PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?", duration)
+        match = DURATION_PATTERN.match(duration)
         if not match:
             return 0
 
@@ -129,8 +108,13 @@ class YouTubeCollector(BaseCollector):
 
         return hours * 3600 + minutes * 60 + seconds
 
-    def _parse_video(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Parse a liked video into standardized format."""
+    def _parse_video(self, item: Dict[str, Any], durations: Dict[str, int]) -> Optional[Dict[str, Any]]:
+        """Parse a liked video into standardized format.
+
+        Args:
+            item: playlistItems resource for the liked video
+            durations: Video durations in seconds keyed by video ID
+        """
         try:
             snippet = item.get("snippet", {})
             video_id = item.get("contentDetails", {}).get("videoId", "")
@@ -138,15 +122,16 @@ class YouTubeCollector(BaseCollector):
             if not video_id:
                 return None
 
-            # Check if it's a short
-            if self._is_short(video_id):
-                self.logger.debug(f"Skipping Short video: {snippet.get('title', 'Unknown')}")
+            # Check if it's a short; unknown durations are kept
+            duration = durations.get(video_id)
+            if duration is not None and duration <= self.min_duration_seconds:
+                self.logger.debug("Skipping Short video: %s", snippet.get("title", "Unknown"))
                 return None
 
             # Parse published at
             published_at = snippet.get("publishedAt", "")
             try:
-                timestamp = datetime.fromisoformat(published_at.replace("Z", "+00:00"))
+                timestamp = parse_iso_datetime(published_at)
             except:
                 timestamp = datetime.now()
 
@@ -164,9 +149,23 @@ class YouTubeCollector(BaseCollector):
             )
 
         except Exception as e:
-            self.logger.warning(f"Error parsing video: {e}")
+            self.logger.warning("Error parsing video: %s", e)
             return None
 
+    def _fetch_liked_page(self, page_token: Optional[str]) -> Dict[str, Any]:
+        """Fetch one page of the "Liked Videos" playlist.
+
+        Uses the calling thread's own HTTP connection so pages can be
+        prefetched from a worker thread.
+        """
+        return self.service.playlistItems().list(
+            part="snippet,contentDetails",
+            playlistId="LL",  # "Liked Videos" playlist
+            maxResults=50,
+            pageToken=page_token,
+            fields=PLAYLIST_ITEM_FIELDS,
+        ).execute(http=get_thread_http(self.creds))
+
     def collect(self, since: datetime) -> List[Dict[str, Any]]:
         """Collect liked videos since the given date, excluding Shorts."""
         events = []
@@ -181,58 +180,76 @@ class YouTubeCollector(BaseCollector):
             # Format datetime for API (RFC 3339)
             since_str = since.isoformat() + "Z"
 
-            # Get liked videos
-            playlist_id = "LL"  # "Liked Videos" playlist
-            page_token = None
             total_checked = 0
 
-            while True:
-                # Query playlist items
-                request = self.service.playlistItems().list(
-                    part="snippet,contentDetails",
-                    playlistId=playlist_id,
-                    maxResults=50,
-                    pageToken=page_token,
-                )
+            # publishedAt is always UTC; make since timezone-aware once for comparison
+            since_aware = since if since.tzinfo else since.replace(tzinfo=timezone.utc)
 
-                response = request.execute()
-                items = response.get("items", [])
-
-                if not items:
-                    break
-
-                for item in items:
-                    total_checked += 1
-
-                    # Check if video is after our cutoff
-                    snippet = item.get("snippet", {})
-                    published_at = snippet.get("publishedAt", "")
-
-                    try:
-                        video_time = datetime.fromisoformat(published_at.replace("Z", "+00:00"))
-                        # Make since timezone-aware for comparison
-                        since_aware = since.replace(tzinfo=video_time.tzinfo) if since.tzinfo is None else since
-                        if video_time < since_aware:
-                            # Videos are returned in reverse chronological order
-                            # So we can stop once we hit an old one
-                            self.logger.info(f"Reached videos older than {since}, stopping")
-                            break
-                    except:
-                        continue
-
-                    # Parse and add event
-                    parsed = self._parse_video(item)
-                    if parsed:
-                        events.append(parsed)
-
-                else:
-                    # Continue to next page if we didn't break
-                    page_token = response.get("nextPageToken")
-                    if not page_token:
+            # The next page is fetched on a worker thread while the current
+            # page's durations are looked up, overlapping the two round trips
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                response = self._fetch_liked_page(None)
+
+                while True:
+                    items = response.get("items", [])
+
+                    if not items:
                         break
-                    continue
 
-                break
+                    # Keep the items inside the window; videos are returned in
+                    # reverse chronological order, so stop at the first old one
+                    recent_items = []
+                    reached_cutoff = False
+                    for item in items:
+                        total_checked += 1
+
+                        # Check if video is after our cutoff
+                        snippet = item.get("snippet", {})
+                        published_at = snippet.get("publishedAt", "")
+
+                        try:
+                            video_time = parse_iso_datetime(published_at)
+                            if video_time < since_aware:
+                                self.logger.info(f"Reached videos older than {since}, stopping")
+                                reached_cutoff = True
+                                break
+                        except:
+                            continue
+
+                        recent_items.append(item)
+
+                    # Prefetch the next page unless this one crossed the cutoff
+                    next_page = None
+                    page_token = response.get("nextPageToken")
+                    if page_token and not reached_cutoff:
+                        next_page = executor.submit(self._fetch_liked_page, page_token)
+
+                    # Skip videos already stored by an earlier run
+                    video_ids = [
+                        item["contentDetails"]["videoId"]
+                        for item in recent_items
+                        if item.get("contentDetails", {}).get("videoId")
+                    ]
+                    known_ids = self.db.get_known_external_ids("youtube", video_ids)
+                    if known_ids:
+                        recent_items = [
+                            item for item in recent_items
+                            if item.get("contentDetails", {}).get("videoId") not in known_ids
+                        ]
+                        video_ids = [vid for vid in video_ids if vid not in known_ids]
+
+                    # One videos.list call covers the whole page (max 50 IDs)
+                    durations = self._get_durations(video_ids)
+
+                    # Parse and add events
+                    for item in recent_items:
+                        parsed = self._parse_video(item, durations)
+                        if parsed:
+                            events.append(parsed)
+
+                    if next_page is None:
+                        break
+                    response = next_page.result()
 
             self.logger.info(f"YouTube collection complete. Checked {total_checked} videos, "
                            f"collected {len(events)} non-Short videos")
@@ -5,22 +5,67 @@ Supports loading from environment variables and config files.
 
 import os
 import json
+import threading
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional
-from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional
+from dataclasses import dataclass, field, fields
 from dotenv import load_dotenv
 
-load_dotenv()
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library json module
+    orjson = None
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DOTENV_PATH = PROJECT_ROOT / ".env"
 
 SETTINGS_INSTANCE: Optional["Settings"] = None
+_SETTINGS_LOCK = threading.Lock()
+
+
+def read_json(path: Path) -> Any:
+    """Read a JSON file, with orjson when available."""
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def write_json(path: Path, data: Any) -> None:
+    """
+    Write data as 2-space indented JSON, with orjson when available.
+    
+    Writes and fsyncs a temporary file, then renames it over the target, so
+    neither readers nor a crash can leave a partially written file.
+    """
+    if orjson is not None:
+        content = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        content = json.dumps(data, indent=2).encode("utf-8")
+    
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())  # Data must be on disk before the rename
+    os.replace(tmp_path, path)
 
 
-@dataclass
+@lru_cache(maxsize=1)
+def _load_dotenv_once() -> None:
+    """Read .env into the environment, only on the first call per process."""
+    # One stat of the known location instead of dotenv's parent-directory walk
+    if DOTENV_PATH.exists():
+        load_dotenv(dotenv_path=DOTENV_PATH, override=False)
+
+
+@dataclass(slots=True)
 class DatabaseConfig:
     path: str = "data/activity_system.db"
 
 
-@dataclass
+@dataclass(slots=True)
 class GithubConfig:
     token: str = ""
     username: str = ""
@@ -29,46 +74,52 @@ class GithubConfig:
     fetch_prs: bool = True
     fetch_issues: bool = True
     fetch_reviews: bool = True
+    max_workers: int = 4  # Repositories fetched concurrently
+    poll_interval_seconds: int = 60  # Minimum gap between polls of the same window
 
 
-@dataclass
+@dataclass(slots=True)
 class GmailConfig:
     credentials_path: str = ""
     token_path: str = "data/gmail_token.json"
     query_days: int = 7
     labels: list = field(default_factory=lambda: ["INBOX", "SENT"])
+    page_size: int = 500  # messages.list maxResults (API max 500)
+    paginate: bool = True  # Follow nextPageToken instead of stopping at one page
 
 
-@dataclass
+@dataclass(slots=True)
 class CalendarConfig:
     credentials_path: str = ""
     token_path: str = "data/calendar_token.json"
     calendars: list = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class YouTubeConfig:
     credentials_path: str = ""
     token_path: str = "data/youtube_token.json"
     min_duration_seconds: int = 60  # Filter out videos shorter than this
 
 
-@dataclass
+@dataclass(slots=True)
 class OpenAIConfig:
     api_key: str = ""
     model: str = "gpt-4o-mini"
     temperature: float = 0.3
     max_tokens: int = 2000
     embedding_model: str = "text-embedding-3-small"
+    max_concurrency: int = 4  # LLM requests in flight at once
+    cache_ttl_hours: int = 24  # Reuse identical-prompt responses this long; 0 disables
 
 
-@dataclass
+@dataclass(slots=True)
 class ObsidianConfig:
     project_vault: str = ""
     personal_vault: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class Project:
     name: str = ""
     description: str = ""
@@ -78,11 +129,14 @@ class Project:
     created_at: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class Settings:
     app_name: str = "Personal Activity Intelligence System"
     version: str = "1.0.0"
     debug: bool = False
+    log_async: bool = True  # Write app logs from a background thread
+    log_max_bytes: int = 10 * 1024 * 1024  # Rotate app.log at this size
+    log_backup_count: int = 5  # Gzipped app.log backups to keep
     data_dir: str = "data"
     log_dir: str = "logs"
     config_dir: str = "config"
@@ -96,10 +150,97 @@ class Settings:
     obsidian: ObsidianConfig = field(default_factory=ObsidianConfig)
     projects: Dict[str, Project] = field(default_factory=dict)
     
-    def __post_init__(self):
-        Path(self.data_dir).mkdir(parents=True, exist_ok=True)
-        Path(self.log_dir).mkdir(parents=True, exist_ok=True)
-        Path(self.config_dir).mkdir(parents=True, exist_ok=True)
+    @classmethod
+    def from_env(cls, env: Optional[Dict[str, str]] = None) -> "Settings":
+        """
+        Build settings from PAIS_* environment variables.
+        
+        Args:
+            env: Environment mapping; defaults to a snapshot of os.environ
+                taken once, rather than a lookup per field
+        """
+        env = dict(os.environ) if env is None else env
+        
+        values: Dict[str, Any] = {}
+        for section, config_cls, entries in _ENV_PLAN:
+            section_values: Dict[str, Any] = {}
+            for key, default, cast, name in entries:
+                value = env.get(key, default)
+                if not value and default is None:
+                    continue  # Unset or empty: keep the dataclass default
+                section_values[name] = cast(value)
+            
+            if config_cls is None:
+                values.update(section_values)
+            else:
+                values[section] = config_cls(**section_values)
+        
+        return cls(**values)
+
+
+def _to_bool(value: str) -> bool:
+    return value.lower() == "true"
+
+
+def _to_list(value: str) -> list:
+    return value.split(",") if value else []
+
+
+# (environment variable, default, cast, settings attribute). A None default
+# keeps the dataclass default when the variable is unset or empty.
+_ENV_FIELDS = (
+    ("PAIS_DEBUG", "false", _to_bool, "debug"),
+    ("PAIS_LOG_ASYNC", "true", _to_bool, "log_async"),
+    ("PAIS_LOG_MAX_BYTES", str(10 * 1024 * 1024), int, "log_max_bytes"),
+    ("PAIS_LOG_BACKUP_COUNT", "5", int, "log_backup_count"),
+    ("PAIS_DATA_DIR", "data", str, "data_dir"),
+    ("PAIS_LOG_DIR", "logs", str, "log_dir"),
+    ("PAIS_CONFIG_DIR", "config", str, "config_dir"),
+    ("PAIS_DB_PATH", "data/activity_system.db", str, "database.path"),
+    ("PAIS_GITHUB_TOKEN", "", str, "github.token"),
+    ("PAIS_GITHUB_USERNAME", "", str, "github.username"),
+    ("PAIS_GITHUB_REPOS", None, _to_list, "github.repos"),
+    ("PAIS_GMAIL_CREDENTIALS_PATH", "", str, "gmail.credentials_path"),
+    ("PAIS_GMAIL_TOKEN_PATH", "data/gmail_token.json", str, "gmail.token_path"),
+    ("PAIS_GMAIL_LABELS", None, _to_list, "gmail.labels"),
+    ("PAIS_CALENDAR_CREDENTIALS_PATH", "", str, "calendar.credentials_path"),
+    ("PAIS_CALENDAR_TOKEN_PATH", "data/calendar_token.json", str, "calendar.token_path"),
+    ("PAIS_YOUTUBE_CREDENTIALS_PATH", "", str, "youtube.credentials_path"),
+    ("PAIS_YOUTUBE_TOKEN_PATH", "data/youtube_token.json", str, "youtube.token_path"),
+    ("PAIS_YOUTUBE_MIN_DURATION", "60", int, "youtube.min_duration_seconds"),
+    ("PAIS_OPENAI_API_KEY", "", str, "openai.api_key"),
+    ("PAIS_OPENAI_MODEL", "gpt-4o-mini", str, "openai.model"),
+    ("PAIS_OPENAI_TEMPERATURE", "0.3", float, "openai.temperature"),
+    ("PAIS_OPENAI_MAX_TOKENS", "2000", int, "openai.max_tokens"),
+    ("PAIS_OPENAI_EMBEDDING_MODEL", "text-embedding-3-small", str, "openai.embedding_model"),
+    ("PAIS_OPENAI_MAX_CONCURRENCY", "4", int, "openai.max_concurrency"),
+    ("PAIS_OPENAI_CACHE_TTL_HOURS", "24", int, "openai.cache_ttl_hours"),
+    ("PAIS_OBSIDIAN_PROJECT_VAULT", "", str, "obsidian.project_vault"),
+    ("PAIS_OBSIDIAN_PERSONAL_VAULT", "", str, "obsidian.personal_vault"),
+)
+
+
+def _plan_env_fields(env_fields: tuple) -> tuple:
+    """
+    Resolve the dotted paths in _ENV_FIELDS once, at import.
+    
+    Returns (section, config class, entries) groups, where section is ""
+    and config class None for top-level Settings fields, and each entry is
+    (environment variable, default, cast, field name).
+    """
+    config_classes = {f.name: f.default_factory for f in fields(Settings)}
+    grouped: Dict[str, list] = {}
+    for key, default, cast, path in env_fields:
+        section, _, name = path.rpartition(".")
+        grouped.setdefault(section, []).append((key, default, cast, name))
+    
+    return tuple(
+        (section, config_classes[section] if section else None, tuple(entries))
+        for section, entries in grouped.items()
+    )
+
+
+_ENV_PLAN = _plan_env_fields(_ENV_FIELDS)
 
 
 def load_settings(config_file: Optional[str] = None) -> Settings:
@@ -112,48 +253,23 @@ def load_settings(config_file: Optional[str] = None) -> Settings:
     if SETTINGS_INSTANCE is not None:
         return SETTINGS_INSTANCE
     
-    settings = Settings()
+    # Double-checked so concurrent first calls build settings only once
+    with _SETTINGS_LOCK:
+        if SETTINGS_INSTANCE is None:
+            SETTINGS_INSTANCE = _build_settings(config_file)
+    return SETTINGS_INSTANCE
+
+
+def _build_settings(config_file: Optional[str]) -> Settings:
+    """Build settings from the environment, config file and projects.json."""
+    _load_dotenv_once()
     
     # Load from environment variables
-    settings.debug = os.getenv("PAIS_DEBUG", "false").lower() == "true"
-    settings.data_dir = os.getenv("PAIS_DATA_DIR", "data")
-    settings.log_dir = os.getenv("PAIS_LOG_DIR", "logs")
-    settings.config_dir = os.getenv("PAIS_CONFIG_DIR", "config")
-    
-    # Database config
-    settings.database.path = os.getenv("PAIS_DB_PATH", "data/activity_system.db")
-    
-    # GitHub config
-    settings.github.token = os.getenv("PAIS_GITHUB_TOKEN", "")
-    settings.github.username = os.getenv("PAIS_GITHUB_USERNAME", "")
-    if os.getenv("PAIS_GITHUB_REPOS"):
-        settings.github.repos = os.getenv("PAIS_GITHUB_REPOS", "").split(",")
+    settings = Settings.from_env()
     
-    # Gmail config
-    settings.gmail.credentials_path = os.getenv("PAIS_GMAIL_CREDENTIALS_PATH", "")
-    settings.gmail.token_path = os.getenv("PAIS_GMAIL_TOKEN_PATH", "data/gmail_token.json")
-    if os.getenv("PAIS_GMAIL_LABELS"):
-        settings.gmail.labels = os.getenv("PAIS_GMAIL_LABELS", "").split(",")
-    
-    # Calendar config
-    settings.calendar.credentials_path = os.getenv("PAIS_CALENDAR_CREDENTIALS_PATH", "")
-    settings.calendar.token_path = os.getenv("PAIS_CALENDAR_TOKEN_PATH", "data/calendar_token.json")
-    
-    # YouTube config
-    settings.youtube.credentials_path = os.getenv("PAIS_YOUTUBE_CREDENTIALS_PATH", "")
-    settings.youtube.token_path = os.getenv("PAIS_YOUTUBE_TOKEN_PATH", "data/youtube_token.json")
-    settings.youtube.min_duration_seconds = int(os.getenv("PAIS_YOUTUBE_MIN_DURATION", "60"))
-    
-    # OpenAI config
-    settings.openai.api_key = os.getenv("PAIS_OPENAI_API_KEY", "")
-    settings.openai.model = os.getenv("PAIS_OPENAI_MODEL", "gpt-4o-mini")
-    settings.openai.temperature = float(os.getenv("PAIS_OPENAI_TEMPERATURE", "0.3"))
-    settings.openai.max_tokens = int(os.getenv("PAIS_OPENAI_MAX_TOKENS", "2000"))
-    settings.openai.embedding_model = os.getenv("PAIS_OPENAI_EMBEDDING_MODEL", "text-embedding-3-small")
-    
-    # Obsidian config
-    settings.obsidian.project_vault = os.getenv("PAIS_OBSIDIAN_PROJECT_VAULT", "")
-    settings.obsidian.personal_vault = os.getenv("PAIS_OBSIDIAN_PERSONAL_VAULT", "")
+    # Create the configured directories once, after overrides are applied
+    for directory in (settings.data_dir, settings.log_dir, settings.config_dir):
+        Path(directory).mkdir(parents=True, exist_ok=True)
     
     # Load from config file if provided
     if config_file and Path(config_file).exists():
@@ -164,62 +280,50 @@ def load_settings(config_file: Optional[str] = None) -> Settings:
     # Load projects from config file if it exists
     projects_file = Path(settings.config_dir) / "projects.json"
     if projects_file.exists():
-        with open(projects_file, "r") as f:
-            projects_data = json.load(f)
-            for name, data in projects_data.items():
-                settings.projects[name] = Project(
-                    name=name,
-                    description=data.get("description", ""),
-                    tags=data.get("tags", []),
-                    keywords=data.get("keywords", []),
-                    active=data.get("active", True),
-                    created_at=data.get("created_at", "")
-                )
+        projects_data = read_json(projects_file)
+        for name, data in projects_data.items():
+            settings.projects[name] = Project(
+                name=name,
+                description=data.get("description", ""),
+                tags=data.get("tags", []),
+                keywords=data.get("keywords", []),
+                active=data.get("active", True),
+                created_at=data.get("created_at", "")
+            )
     
-    SETTINGS_INSTANCE = settings
     return settings
 
 
 def _merge_config_data(settings: Settings, data: Dict[str, Any]) -> Settings:
     """Merge dictionary config data into settings object."""
-    if "database" in data:
-        for key, value in data["database"].items():
-            if hasattr(settings.database, key):
-                setattr(settings.database, key, value)
-    
-    if "github" in data:
-        for key, value in data["github"].items():
-            if hasattr(settings.github, key):
-                setattr(settings.github, key, value)
-    
-    if "gmail" in data:
-        for key, value in data["gmail"].items():
-            if hasattr(settings.gmail, key):
-                setattr(settings.gmail, key, value)
-    
-    if "calendar" in data:
-        for key, value in data["calendar"].items():
-            if hasattr(settings.calendar, key):
-                setattr(settings.calendar, key, value)
-    
-    if "youtube" in data:
-        for key, value in data["youtube"].items():
-            if hasattr(settings.youtube, key):
-                setattr(settings.youtube, key, value)
-    
-    if "openai" in data:
-        for key, value in data["openai"].items():
-            if hasattr(settings.openai, key):
-                setattr(settings.openai, key, value)
-    
-    if "obsidian" in data:
-        for key, value in data["obsidian"].items():
-            if hasattr(settings.obsidian, key):
-                setattr(settings.obsidian, key, value)
+    for section, allowed in _SECTION_FIELDS.items():
+        section_data = data.get(section)
+        if not section_data:
+            continue
+        
+        target = getattr(settings, section)
+        for key, value in section_data.items():
+            if key in allowed:
+                setattr(target, key, value)
     
     return settings
 
 
+# Settings sections that can be overridden from a config file, with their fields
+_SECTION_FIELDS: Dict[str, frozenset] = {
+    section: frozenset(f.name for f in fields(config_cls))
+    for section, config_cls in (
+        ("database", DatabaseConfig),
+        ("github", GithubConfig),
+        ("gmail", GmailConfig),
+        ("calendar", CalendarConfig),
+        ("youtube", YouTubeConfig),
+        ("openai", OpenAIConfig),
+        ("obsidian", ObsidianConfig),
+    )
+}
+
+
 def get_settings() -> Settings:
     """Get the singleton settings instance. Loads if not already loaded."""
     if SETTINGS_INSTANCE is None:
@@ -227,19 +331,12 @@ def get_settings() -> Settings:
     return SETTINGS_INSTANCE
 
 
-def get_model_config(model_name: str = "default") -> Dict[str, Any]:
-    """
-    Get configuration for a specific AI model.
-    
-    Args:
-        model_name: Name of the model configuration to retrieve
-        
-    Returns:
-        Dictionary containing model configuration
-    """
+@lru_cache(maxsize=1)
+def _model_configs(settings_id: int) -> Dict[str, Dict[str, Any]]:
+    """Build the model presets once per settings instance (keyed by id)."""
     settings = get_settings()
     
-    configs = {
+    return {
         "default": {
             "model": settings.openai.model,
             "temperature": settings.openai.temperature,
@@ -264,8 +361,22 @@ def get_model_config(model_name: str = "default") -> Dict[str, Any]:
             "model": settings.openai.embedding_model,
         },
     }
+
+
+def get_model_config(model_name: str = "default") -> Dict[str, Any]:
+    """
+    Get configuration for a specific AI model.
+    
+    Args:
+        model_name: Name of the model configuration to retrieve
+        
+    Returns:
+        Dictionary containing model configuration
+    """
+    configs = _model_configs(id(get_settings()))
     
-    return configs.get(model_name, configs["default"])
+    # Copy so callers can't alter the cached preset
+    return dict(configs.get(model_name, configs["default"]))
 
 
 def get_project(project_name: str) -> Optional[Project]:
@@ -276,24 +387,30 @@ def get_project(project_name: str) -> Optional[Project]:
 
 def save_project(project: Project) -> None:
     """Save or update a project configuration."""
+    save_projects([project])
+
+
+def save_projects(projects: List[Project]) -> None:
+    """Save or update several project configurations with a single write."""
+    if not projects:
+        return
+    
     settings = get_settings()
-    settings.projects[project.name] = project
+    for project in projects:
+        settings.projects[project.name] = project
     
-    # Save to file
+    # settings.projects mirrors projects.json (loaded at startup), so write
+    # it out directly instead of re-reading the file
     projects_file = Path(settings.config_dir) / "projects.json"
-    projects_data = {}
-    
-    if projects_file.exists():
-        with open(projects_file, "r") as f:
-            projects_data = json.load(f)
-    
-    projects_data[project.name] = {
-        "description": project.description,
-        "tags": project.tags,
-        "keywords": project.keywords,
-        "active": project.active,
-        "created_at": project.created_at,
+    projects_data = {
+        name: {
+            "description": p.description,
+            "tags": p.tags,
+            "keywords": p.keywords,
+            "active": p.active,
+            "created_at": p.created_at,
+        }
+        for name, p in settings.projects.items()
     }
     
-    with open(projects_file, "w") as f:
-        json.dump(projects_data, f, indent=2)
+    write_json(projects_file, projects_data)
@@ -4,58 +4,237 @@ Manages scheduling, data collection, and processing.
 """
 
 import asyncio
+import atexit
+import gzip
 import json
 import logging
+import os
+import queue
+import shutil
 import signal
 import sys
 import threading
 import time
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener, RotatingFileHandler
 
 import uvicorn
-from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.executors.pool import ThreadPoolExecutor as SchedulerThreadPool
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.interval import IntervalTrigger
 
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib json module
+    orjson = None
+
+try:
+    import uvloop
+except ImportError:  # Fall back to the stdlib event loop
+    uvloop = None
+
 from api.server import app
 from collectors.calendar_collector import CalendarCollector
 from collectors.gmail_collector import GmailCollector
 from collectors.github_collector import GitHubCollector
 from collectors.youtube_collector import YouTubeCollector
-from config.settings import get_settings, load_settings, Project, save_project
-from processing.ai_processor import AIProcessor, ProcessingResult
+from config.settings import get_settings, load_settings, Project, save_projects
+from processing.ai_processor import AIProcessor, ProcessingResult, WeeklyJob
 from processing.batch_manager import BatchManager
 from processing.project_detector import ProjectDetector
-from storage.database import Database, Activity, Entity
-from storage.obsidian_writer import ObsidianWriter
+from storage.database import Database, Activity, Entity, get_default_db
+from storage.obsidian_writer import ActivityRow, ObsidianWriter
 
 # Global components for graceful shutdown
 db: Optional[Database] = None
-scheduler: Optional[BackgroundScheduler] = None
+scheduler: Optional[AsyncIOScheduler] = None
 obsidian_writer: Optional[ObsidianWriter] = None
+# Reused across scheduler ticks instead of rebuilt each run
+batch_manager: Optional[BatchManager] = None
+processor: Optional[AIProcessor] = None
 shutdown_event = threading.Event()
+# Background thread writing queued log records, when log_async is set
+log_listener: Optional[QueueListener] = None
+# Vault writes handed off by check_and_process, run in order by one thread
+obsidian_write_queue: "queue.Queue[Tuple[Callable[..., Any], Tuple[Any, ...]]]" = queue.Queue()
+_obsidian_worker: Optional[threading.Thread] = None
+_obsidian_worker_lock = threading.Lock()
+
+
+SCHEDULER_WORKERS = 4  # Scheduler pool for collection jobs
+SCHEDULER_AI_WORKERS = 2  # Scheduler pool for LLM processing jobs
+LOG_BUFFER_CAPACITY = 512  # Records held before app.log is written
+LOG_FLUSH_INTERVAL = 5  # Seconds between periodic flushes of app.log
+SEEN_EVENTS_MAX = 100_000  # Recently stored event keys kept for deduplication
+_logging_initialised = False
+
+# Keys of recently stored events, oldest first; see _event_key
+_seen_events: "OrderedDict[Tuple[str, str, str, int], None]" = OrderedDict()
+
+
+def _to_json(data: Any) -> str:
+    """Serialize data for a TEXT column, with orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(data)
+
+
+def _event_key(row: Tuple[str, str, str, str]) -> Tuple[str, str, str, int]:
+    """Identify a raw event row by source, type, time and a hash of its payload."""
+    source, event_type, raw_data, event_time = row
+    return (source, event_type, event_time, hash(raw_data))
+
+
+def _drop_seen_events(rows: List[Tuple[str, str, str, str]]) -> List[Tuple[str, str, str, str]]:
+    """Filter out rows already stored recently or repeated within the batch."""
+    batch_keys = set()
+    unseen = []
+    for row in rows:
+        key = _event_key(row)
+        if key in _seen_events:
+            _seen_events.move_to_end(key)
+        elif key not in batch_keys:
+            batch_keys.add(key)
+            unseen.append(row)
+    return unseen
+
+
+def _remember_events(rows: List[Tuple[str, str, str, str]]) -> None:
+    """Record stored rows, evicting the oldest keys past SEEN_EVENTS_MAX."""
+    for row in rows:
+        _seen_events[_event_key(row)] = None
+    while len(_seen_events) > SEEN_EVENTS_MAX:
+        _seen_events.popitem(last=False)
+
+
+def _gzip_namer(name: str) -> str:
+    """Name rotated log backups with a .gz suffix."""
+    return name + ".gz"
+
+
+def _gzip_rotator(source: str, dest: str) -> None:
+    """Compress the rolled-over log into its backup; the live log stays plain."""
+    with open(source, "rb") as sf, gzip.open(dest, "wb") as df:
+        shutil.copyfileobj(sf, df)
+    os.remove(source)
+
+
+class CountingRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler that tracks the file size itself.
+
+    The stdlib handler stats the file, seeks to its end and formats the
+    record twice on every emit to decide whether to roll over; this keeps
+    a running byte count instead.
+    """
+
+    def __init__(self, filename: Path, **kwargs: Any):
+        super().__init__(filename, **kwargs)
+        self._bytes_written = os.path.getsize(self.baseFilename) if os.path.exists(self.baseFilename) else 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            msg = self.format(record) + self.terminator
+            # Size with the opened stream's codec; self.encoding may be the
+            # "locale" placeholder, which str.encode does not accept
+            size = len(msg.encode(self.stream.encoding, errors="replace"))
+            if self.maxBytes > 0 and self._bytes_written and self._bytes_written + size >= self.maxBytes:
+                self.doRollover()
+                self._bytes_written = 0
+                if self.stream is None:
+                    self.stream = self._open()
+
+            self.stream.write(msg)
+            self.flush()
+            self._bytes_written += size
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+def _flush_log_buffer(handler: MemoryHandler) -> None:
+    """Periodically write buffered records so app.log never lags far behind."""
+    while not shutdown_event.wait(LOG_FLUSH_INTERVAL):
+        handler.flush()
+    handler.flush()
 
 
 def setup_logging() -> None:
-    """Set up logging for the main application."""
+    """Set up logging for the main application. Later calls are no-ops."""
+    global _logging_initialised, log_listener
+    if _logging_initialised:
+        return
+    _logging_initialised = True
+
     settings = get_settings()
     log_dir = Path(settings.log_dir)
     log_dir.mkdir(parents=True, exist_ok=True)
 
+    # No format uses thread/process info or funcName/lineno, so skip
+    # collecting them (the caller lookup walks the stack on every record)
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    if not settings.debug:
+        logging._srcfile = None
+
     # Main application log
     log_file = log_dir / "app.log"
 
-    # Configure root logger
+    formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    file_handler = CountingRotatingFileHandler(
+        log_file,
+        maxBytes=settings.log_max_bytes,
+        backupCount=settings.log_backup_count,
+        encoding="utf-8",
+    )
+    file_handler.namer = _gzip_namer
+    file_handler.rotator = _gzip_rotator
+    stream_handler = logging.StreamHandler(sys.stdout)
+    file_handler.setFormatter(formatter)
+    stream_handler.setFormatter(formatter)
+
+    # Coalesce file writes; errors are written through immediately
+    file_buffer = MemoryHandler(
+        LOG_BUFFER_CAPACITY, flushLevel=logging.ERROR, target=file_handler
+    )
+    threading.Thread(
+        target=_flush_log_buffer, args=(file_buffer,), name="log-flush", daemon=True
+    ).start()
+
+    handlers: List[logging.Handler] = [file_buffer, stream_handler]
+
+    if settings.log_async:
+        # Hand records to a background thread so callers never block on disk
+        log_queue: queue.Queue = queue.Queue(-1)
+        log_listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        log_listener.start()
+        atexit.register(stop_log_listener)  # Flush queued records on exit
+
+        # The file/stream handlers apply the full format; the queue only
+        # needs the rendered message (plus any traceback)
+        queue_handler = QueueHandler(log_queue)
+        queue_handler.setFormatter(logging.Formatter("%(message)s"))
+        handlers = [queue_handler]
+
+    # Configure root logger; force replaces the handler api.server
+    # installs at import time, which would otherwise make this a no-op
     logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[
-            logging.FileHandler(log_file),
-            logging.StreamHandler(sys.stdout),
-        ],
+        level=logging.DEBUG if settings.debug else logging.INFO,
+        handlers=handlers,
+        force=True,
     )
+    if not settings.debug:
+        # Drop debug calls before any logger level is consulted
+        logging.disable(logging.DEBUG)
 
     # Reduce noise from third-party libraries
     logging.getLogger("apscheduler").setLevel(logging.WARNING)
@@ -65,21 +244,104 @@ def setup_logging() -> None:
     logger.info(f"Logging initialized. Log file: {log_file}")
 
 
+def stop_log_listener() -> None:
+    """Write out any queued log records and stop the listener thread."""
+    global log_listener
+    if log_listener:
+        log_listener.stop()
+        log_listener = None
+
+
+def get_obsidian_writer() -> ObsidianWriter:
+    """Get the shared ObsidianWriter, creating the vault folders on first use."""
+    global obsidian_writer
+    if obsidian_writer is None:
+        settings = get_settings()
+        project_vault = settings.obsidian.project_vault or str(Path(settings.data_dir) / "project-vault")
+        personal_vault = settings.obsidian.personal_vault or str(Path(settings.data_dir) / "personal-vault")
+        obsidian_writer = ObsidianWriter(
+            project_vault=str(project_vault),
+            personal_vault=str(personal_vault),
+        )
+    return obsidian_writer
+
+
+def _drain_obsidian_writes() -> None:
+    """Run queued vault writes one at a time, for the life of the process."""
+    logger = logging.getLogger(__name__)
+    while True:
+        write, args = obsidian_write_queue.get()
+        try:
+            write(*args)
+        except Exception as e:
+            logger.error(f"Error writing to Obsidian: {e}")
+        finally:
+            obsidian_write_queue.task_done()
+
+
+def queue_obsidian_write(write: Callable[..., Any], *args: Any) -> None:
+    """
+    Queue a vault write to run on the background writer thread.
+
+    Writes run in the order they were queued, so later notes never race
+    earlier ones for the same file.
+
+    Args:
+        write: ObsidianWriter method to call
+        *args: Positional arguments for the method
+    """
+    global _obsidian_worker
+    with _obsidian_worker_lock:
+        if _obsidian_worker is None:
+            _obsidian_worker = threading.Thread(
+                target=_drain_obsidian_writes, name="obsidian-writer", daemon=True
+            )
+            _obsidian_worker.start()
+            atexit.register(flush_obsidian_writes)
+    obsidian_write_queue.put_nowait((write, args))
+
+
+def flush_obsidian_writes() -> None:
+    """Block until every queued vault write has finished."""
+    obsidian_write_queue.join()
+
+
+def get_processor() -> AIProcessor:
+    """Get the shared AIProcessor, creating its LLM client on first use."""
+    global processor
+    if processor is None:
+        processor = AIProcessor()
+    return processor
+
+
 def signal_handler(signum: int, frame: Any) -> None:
     """Handle shutdown signals gracefully."""
     logger = logging.getLogger(__name__)
     logger.info(f"Received signal {signum}, initiating shutdown...")
     shutdown_event.set()
 
-    # Stop the scheduler
-    global scheduler
-    if scheduler:
-        scheduler.shutdown(wait=True)
-        logger.info("Scheduler stopped")
+    stop_scheduler()
+    flush_obsidian_writes()
 
+    stop_log_listener()
     sys.exit(0)
 
 
+def note_shutdown_signal(signum: int, frame: Any) -> None:
+    """Record a shutdown signal re-raised by uvicorn after it stops serving."""
+    logging.getLogger(__name__).info(f"Received signal {signum}, initiating shutdown...")
+    shutdown_event.set()
+
+
+def stop_scheduler() -> None:
+    """Stop the scheduler, letting running jobs finish. Safe to call twice."""
+    global scheduler
+    if scheduler and scheduler.running:
+        scheduler.shutdown(wait=True)
+        logging.getLogger(__name__).info("Scheduler stopped")
+    scheduler = None
+
+
 def run_collectors() -> None:
     """
     Run all data collectors and store events in the database.
@@ -90,88 +352,84 @@ def run_collectors() -> None:
 
     global db
     if not db:
-        db = Database(get_settings().database.path)
+        db = get_default_db()
 
     settings = get_settings()
     all_events: List[Dict[str, Any]] = []
 
-    # Determine collection window (last hour)
-    since = datetime.now() - timedelta(hours=1)
+    # Determine collection window (last hour); the one clock reading also
+    # stamps events that arrive without a timestamp
+    now = datetime.now()
+    now_iso = now.isoformat()
+    since = now - timedelta(hours=1)
+
+    # Collectors to run this cycle: (name, what is counted, factory)
+    jobs: List[Tuple[str, str, Callable[[], Any]]] = []
 
-    # GitHub Collector
     if settings.github.token:
-        try:
-            logger.info("Collecting GitHub data...")
-            github_collector = GitHubCollector(
-                token=settings.github.token,
-                username=settings.github.username,
-            )
-            github_events = github_collector.collect(since=since)
-            all_events.extend(github_events)
-            logger.info(f"GitHub: collected {len(github_events)} events")
-        except Exception as e:
-            logger.error(f"GitHub collection failed: {e}")
+        jobs.append(("GitHub", "events", lambda: GitHubCollector(
+            token=settings.github.token,
+            username=settings.github.username,
+        )))
     else:
         logger.warning("GitHub token not configured, skipping GitHub collection")
 
-    # Gmail Collector
     if settings.gmail.credentials_path and Path(settings.gmail.credentials_path).exists():
-        try:
-            logger.info("Collecting Gmail data...")
-            gmail_collector = GmailCollector(
-                credentials_path=settings.gmail.credentials_path,
-            )
-            gmail_events = gmail_collector.collect(since=since)
-            all_events.extend(gmail_events)
-            logger.info(f"Gmail: collected {len(gmail_events)} events")
-        except Exception as e:
-            logger.error(f"Gmail collection failed: {e}")
+        jobs.append(("Gmail", "events", lambda: GmailCollector(
+            credentials_path=settings.gmail.credentials_path,
+        )))
     else:
         logger.warning("Gmail credentials not configured, skipping Gmail collection")
 
-    # Calendar Collector
     if settings.calendar.credentials_path and Path(settings.calendar.credentials_path).exists():
-        try:
-            logger.info("Collecting Calendar data...")
-            calendar_collector = CalendarCollector(
-                credentials_path=settings.calendar.credentials_path,
-            )
-            calendar_events = calendar_collector.collect(since=since)
-            all_events.extend(calendar_events)
-            logger.info(f"Calendar: collected {len(calendar_events)} events")
-        except Exception as e:
-            logger.error(f"Calendar collection failed: {e}")
+        jobs.append(("Calendar", "events", lambda: CalendarCollector(
+            credentials_path=settings.calendar.credentials_path,
+        )))
     else:
         logger.warning("Calendar credentials not configured, skipping Calendar collection")
 
-    # YouTube Collector
     if settings.youtube.credentials_path and Path(settings.youtube.credentials_path).exists():
-        try:
-            logger.info("Collecting YouTube liked videos...")
-            youtube_collector = YouTubeCollector(
-                credentials_path=settings.youtube.credentials_path,
-            )
-            youtube_events = youtube_collector.collect(since=since)
-            all_events.extend(youtube_events)
-            logger.info(f"YouTube: collected {len(youtube_events)} liked videos")
-        except Exception as e:
-            logger.error(f"YouTube collection failed: {e}")
+        jobs.append(("YouTube", "liked videos", lambda: YouTubeCollector(
+            credentials_path=settings.youtube.credentials_path,
+        )))
     else:
         logger.warning("YouTube credentials not configured, skipping YouTube collection")
 
+    def collect(name: str, counted: str, make_collector: Callable[[], Any]) -> List[Dict[str, Any]]:
+        """Run one collector over the window, logging how much it found."""
+        logger.info(f"Collecting {name} data...")
+        events = make_collector().collect(since=since)
+        logger.info(f"{name}: collected {len(events)} {counted}")
+        return events
+
+    # Collectors are network-bound, so run them side by side; results are
+    # gathered in submission order to keep the stored order stable
+    if jobs:
+        with ThreadPoolExecutor(max_workers=len(jobs), thread_name_prefix="collector") as executor:
+            futures = [(name, executor.submit(collect, name, counted, factory)) for name, counted, factory in jobs]
+            for name, future in futures:
+                try:
+                    all_events.extend(future.result())
+                except Exception as e:
+                    logger.error(f"{name} collection failed: {e}")
+
     # Store events in database
     if all_events:
         try:
-            events_to_insert: List[tuple] = []
-            for event in all_events:
-                events_to_insert.append((
+            events_to_insert = _drop_seen_events([
+                (
                     event.get("source", "unknown"),
                     event.get("event_type", "unknown"),
-                    json.dumps(event.get("data", {})),
-                    event.get("timestamp", datetime.now().isoformat()),
-                ))
+                    _to_json(event.get("data", {})),
+                    event.get("timestamp", now_iso),
+                )
+                for event in all_events
+            ])
+            if len(events_to_insert) < len(all_events):
+                logger.info(f"Skipped {len(all_events) - len(events_to_insert)} duplicate events")
 
             inserted = db.insert_events(events_to_insert)
+            _remember_events(events_to_insert)
             logger.info(f"Stored {inserted} events in database")
         except Exception as e:
             logger.error(f"Failed to store events: {e}")
@@ -187,20 +445,13 @@ def check_and_process() -> None:
     logger = logging.getLogger(__name__)
     logger.info("Checking if processing is needed...")
 
-    global db, obsidian_writer
+    global db, batch_manager
     if not db:
-        db = Database(get_settings().database.path)
-    if not obsidian_writer:
-        settings = get_settings()
-        project_vault = settings.obsidian.project_vault or str(Path(settings.data_dir) / "project-vault")
-        personal_vault = settings.obsidian.personal_vault or str(Path(settings.data_dir) / "personal-vault")
-        obsidian_writer = ObsidianWriter(
-            project_vault=str(project_vault),
-            personal_vault=str(personal_vault),
-        )
+        db = get_default_db()
 
     # Initialize batch manager
-    batch_manager = BatchManager(db=db)
+    if not batch_manager:
+        batch_manager = BatchManager(db=db)
 
     # Check if processing should run
     if not batch_manager.should_process():
@@ -208,6 +459,7 @@ def check_and_process() -> None:
         return
 
     logger.info("Processing threshold met, starting AI processing...")
+    obsidian_writer = get_obsidian_writer()
 
     try:
         # Get events for processing
@@ -227,7 +479,7 @@ def check_and_process() -> None:
             }
 
         # Run AI processing
-        processor = AIProcessor()
+        processor = get_processor()
         result: ProcessingResult = processor.process_batch(events, existing_projects)
 
         if not result.success:
@@ -253,6 +505,10 @@ def check_and_process() -> None:
         event_ids = [e.id for e in events if e.id]
         db.mark_events_processed(event_ids)
 
+        # Shared by every record this batch writes
+        now_iso = datetime.now().isoformat()
+        raw_event_ids_json = _to_json(event_ids)
+
         logger.info(
             f"Processed {len(events)} events into "
             f"{len(result.activities)} activities, "
@@ -335,6 +591,7 @@ def check_and_process() -> None:
                 {},  # No pre-existing activities for new projects
             )
 
+            new_projects: List[Project] = []
             for project_data in approved_projects:
                 project_name = project_data.get("name", "")
                 if project_name:
@@ -347,35 +604,45 @@ def check_and_process() -> None:
                             project_name, []
                         )),
                         active=True,
-                        created_at=datetime.now().isoformat(),
+                        created_at=now_iso,
                     )
-                    save_project(project)
+                    new_projects.append(project)
                     logger.info(f"Created new project: {project_name}")
 
+            # Rewrite projects.json once for the whole batch
+            save_projects(new_projects)
+
         # Store activities and write to Obsidian
-        activities_by_project: Dict[str, List[Dict[str, Any]]] = {}
-        personal_activities: List[Dict[str, Any]] = []
+        activities_by_project: Dict[str, List[ActivityRow]] = defaultdict(list)
+        personal_activities: List[ActivityRow] = []
         all_tweets: List[Dict[str, Any]] = []
         activity_id_map: Dict[int, int] = {}  # Maps activity index to activity_id
 
-        for idx, activity_data in enumerate(result.activities):
-            project_name = activity_data.get("project", activity_data.get("project_name", "misc"))
-            
-            # Insert into database
-            activity_id = db.insert_activity(
-                timestamp=activity_data.get("timestamp", datetime.now().isoformat()),
-                project_name=project_name,
-                activity_type=activity_data.get("type", activity_data.get("activity_type", "activity")),
-                description=activity_data.get("description", ""),
-                source_refs=json.dumps(activity_data.get("sources", [])),
-                raw_event_ids=json.dumps([e.id for e in events if e.id]),
-            )
+        # Insert all activities in one transaction
+        activity_rows: List[Tuple[str, str, str, str, str, str]] = []
+        for activity_data in result.activities:
+            get = activity_data.get
+            activity_rows.append((
+                get("timestamp", now_iso),
+                get("project", get("project_name", "misc")),
+                get("type", get("activity_type", "activity")),
+                get("description", ""),
+                _to_json(get("sources", [])),
+                raw_event_ids_json,
+            ))
+        activity_ids = db.insert_activities(activity_rows)
+
+        for idx, (activity_data, activity_row, activity_id) in enumerate(
+            zip(result.activities, activity_rows, activity_ids)
+        ):
+            get = activity_data.get
+            _, project_name, activity_type, description, _, _ = activity_row
 
             # Track activity ID for entity relationship creation
             activity_id_map[idx] = activity_id
 
             # Create activity-entity relationships
-            activity_entities = activity_data.get("entities", [])
+            activity_entities = get("entities", [])
             if activity_entities and entity_id_map:
                 try:
                     for entity_name in activity_entities:
@@ -394,30 +661,31 @@ def check_and_process() -> None:
                 except Exception as e:
                     logger.error(f"Error creating activity-entity relationships: {e}")
 
-            activity_dict = {
-                "id": activity_id,
-                "date": activity_data.get("timestamp", "")[:10],
-                "description": activity_data.get("description", ""),
-                "type": activity_data.get("type", activity_data.get("activity_type", "activity")),
-                "technologies": activity_data.get("technologies", []),
-                "project": project_name,
-            }
+            log_entry = ActivityRow(
+                id=activity_id,
+                date=get("timestamp", "")[:10],
+                description=description,
+                type=activity_type,
+                technologies=get("technologies", []),
+                project=project_name,
+            )
 
             if project_name == "misc" or not project_name:
-                personal_activities.append(activity_dict)
+                personal_activities.append(log_entry)
             else:
-                if project_name not in activities_by_project:
-                    activities_by_project[project_name] = []
-                activities_by_project[project_name].append(activity_dict)
-
-        # Store tweet drafts
-        for tweet_data in result.tweets:
-            draft_id = db.insert_tweet_draft(
-                content=tweet_data.get("content", tweet_data.get("tweet", "")),
-                project_name=tweet_data.get("project", tweet_data.get("project_name", "unknown")),
-                activity_ids=json.dumps(tweet_data.get("activity_ids", [])),
-                timestamp=tweet_data.get("timestamp", datetime.now().isoformat()),
+                activities_by_project[project_name].append(log_entry)
+
+        # Store tweet drafts in one transaction
+        draft_ids = db.insert_tweet_drafts([
+            (
+                tweet_data.get("content", tweet_data.get("tweet", "")),
+                tweet_data.get("project", tweet_data.get("project_name", "unknown")),
+                _to_json(tweet_data.get("activity_ids", [])),
+                tweet_data.get("timestamp", now_iso),
             )
+            for tweet_data in result.tweets
+        ])
+        for draft_id, tweet_data in zip(draft_ids, result.tweets):
             all_tweets.append({
                 "id": draft_id,
                 **tweet_data,
@@ -425,28 +693,31 @@ def check_and_process() -> None:
 
         # Write to Obsidian
         try:
-            # Write project activity logs
-            for project_name, activities in activities_by_project.items():
-                # Get project entities for this project
-                project_entities: List[Entity] = []
+            # Get each project's entities for wiki-links and tags
+            entities_by_project: Dict[str, List[Entity]] = {}
+            for project_name in activities_by_project:
                 try:
-                    project_entities = db.get_project_entities(project_name, days=7)
-                    logger.info(f"Retrieved {len(project_entities)} entities for project {project_name}")
+                    entities_by_project[project_name] = db.get_project_entities(project_name, days=7)
+                    logger.info(f"Retrieved {len(entities_by_project[project_name])} entities for project {project_name}")
                 except Exception as e:
                     logger.warning(f"Could not retrieve entities for {project_name}: {e}")
-                
-                obsidian_writer.write_activity_log(project_name, activities, entities=project_entities)
-                logger.info(f"Wrote activity log for {project_name}")
+
+            # Vault files are written on the background writer thread so
+            # slow vault storage doesn't hold up the scheduler
+
+            # Write project activity logs
+            queue_obsidian_write(obsidian_writer.write_activity_logs, activities_by_project, entities_by_project)
+            logger.info(f"Queued activity logs for {len(activities_by_project)} projects")
 
             # Write personal activities
             if personal_activities:
-                obsidian_writer.write_personal_activity_log(personal_activities)
-                logger.info(f"Wrote personal activity log ({len(personal_activities)} activities)")
+                queue_obsidian_write(obsidian_writer.write_personal_activity_log, personal_activities)
+                logger.info(f"Queued personal activity log ({len(personal_activities)} activities)")
 
             # Write tweet drafts
             if all_tweets:
-                obsidian_writer.write_tweet_drafts(all_tweets)
-                logger.info(f"Wrote {len(all_tweets)} tweet drafts")
+                queue_obsidian_write(obsidian_writer.write_tweet_drafts, all_tweets)
+                logger.info(f"Queued {len(all_tweets)} tweet drafts")
 
         except Exception as e:
             logger.error(f"Error writing to Obsidian: {e}")
@@ -463,17 +734,10 @@ def run_weekly_synthesis() -> None:
     logger = logging.getLogger(__name__)
     logger.info("Starting weekly synthesis...")
 
-    global db, obsidian_writer
+    global db
     if not db:
-        db = Database(get_settings().database.path)
-    if not obsidian_writer:
-        settings = get_settings()
-        project_vault = settings.obsidian.project_vault or str(Path(settings.data_dir) / "project-vault")
-        personal_vault = settings.obsidian.personal_vault or str(Path(settings.data_dir) / "personal-vault")
-        obsidian_writer = ObsidianWriter(
-            project_vault=str(project_vault),
-            personal_vault=str(personal_vault),
-        )
+        db = get_default_db()
+    obsidian_writer = get_obsidian_writer()
 
     try:
         # Get activities from last 7 days
@@ -481,35 +745,31 @@ def run_weekly_synthesis() -> None:
         start_date = end_date - timedelta(days=7)
 
         settings = get_settings()
-        processor = AIProcessor()
+        processor = get_processor()
+
+        # One query for the week, grouped by project
+        activities_by_project = db.get_activities_by_project(start=start_date, end=end_date)
 
-        # Process each active project
+        # Collect each active project's activities and current README
+        jobs: List[WeeklyJob] = []
         for project_name in settings.projects.keys():
-            # Get activities for this project
-            activities = db.get_activities_for_period(
-                start=start_date,
-                end=end_date,
-                project_name=project_name,
-            )
+            activities = activities_by_project.get(project_name)
 
             if not activities:
                 logger.debug(f"No activities for {project_name} this week")
                 continue
 
-            # Read current README if exists
-            project_folder = obsidian_writer.ensure_project_folder(project_name)
-            readme_file = project_folder / "README.md"
-            current_readme = ""
-            if readme_file.exists():
-                current_readme = readme_file.read_text(encoding="utf-8")
-
-            # Generate weekly summary
-            weekly_summary = processor.weekly_synthesis(
-                project_name=project_name,
-                activities=activities,
-                current_readme=current_readme,
-            )
+            jobs.append((project_name, activities, obsidian_writer.read_project_readme(project_name)))
+
+        if not jobs:
+            logger.info("Weekly synthesis completed")
+            return
 
+        # Request the summaries concurrently, then write READMEs in order
+        summaries = processor.weekly_synthesis_many(jobs)
+
+        # Write READMEs one at a time
+        for (project_name, _, _), weekly_summary in zip(jobs, summaries):
             # Get project entities for README enhancement
             project_entities: List[Entity] = []
             try:
@@ -528,7 +788,7 @@ def run_weekly_synthesis() -> None:
         logger.error(f"Error during weekly synthesis: {e}")
 
 
-def setup_scheduler() -> BackgroundScheduler:
+def setup_scheduler() -> AsyncIOScheduler:
     """
     Configure and start the APScheduler with all jobs.
 
@@ -537,13 +797,24 @@ def setup_scheduler() -> BackgroundScheduler:
     - Every hour: check_and_process() (only if thresholds met)
     - Sunday 20:00: run_weekly_synthesis()
 
+    The scheduler runs on the API server's event loop; the jobs themselves
+    block, so they are handed to its thread pools.
+
     Returns:
-        Configured BackgroundScheduler instance
+        Configured AsyncIOScheduler instance
     """
     logger = logging.getLogger(__name__)
     logger.info("Setting up scheduler...")
 
-    scheduler = BackgroundScheduler()
+    # AI jobs get their own pool so collection never queues behind a long
+    # LLM run; a tick that overruns is skipped rather than stacked up
+    scheduler = AsyncIOScheduler(
+        executors={
+            "default": SchedulerThreadPool(SCHEDULER_WORKERS),
+            "ai": SchedulerThreadPool(SCHEDULER_AI_WORKERS),
+        },
+        job_defaults={"max_instances": 1, "coalesce": True},
+    )
 
     # Run collectors every hour
     scheduler.add_job(
@@ -561,6 +832,7 @@ def setup_scheduler() -> BackgroundScheduler:
         trigger=IntervalTrigger(hours=1),
         id="processor",
         name="Batch Processing",
+        executor="ai",
         replace_existing=True,
     )
     logger.info("Scheduled: check_and_process() every hour")
@@ -571,6 +843,7 @@ def setup_scheduler() -> BackgroundScheduler:
         trigger=CronTrigger(day_of_week="sun", hour=20, minute=0),
         id="weekly_synthesis",
         name="Weekly Synthesis",
+        executor="ai",
         replace_existing=True,
     )
     logger.info("Scheduled: run_weekly_synthesis() Sundays at 20:00")
@@ -578,18 +851,39 @@ def setup_scheduler() -> BackgroundScheduler:
     return scheduler
 
 
+async def serve_with_scheduler(server: uvicorn.Server) -> None:
+    """Start the scheduler on the running loop, then serve the API until shutdown."""
+    global scheduler
+    scheduler = setup_scheduler()
+    scheduler.start()
+    logging.getLogger(__name__).info("Scheduler started")
+
+    try:
+        await server.serve()
+    finally:
+        stop_scheduler()
+
+
 def run_api_server() -> None:
-    """Run the FastAPI server using uvicorn."""
+    """Run the FastAPI server using uvicorn, with the scheduler on the same loop."""
     logger = logging.getLogger(__name__)
     logger.info("Starting FastAPI server...")
 
+    server = uvicorn.Server(uvicorn.Config(
+        app,
+        host="0.0.0.0",
+        port=8000,
+        log_level="info",
+    ))
+
+    # uvicorn handles SIGINT/SIGTERM while serving and re-raises them once it
+    # has shut down; by then only note the signal, main() does the cleanup
+    signal.signal(signal.SIGINT, note_shutdown_signal)
+    signal.signal(signal.SIGTERM, note_shutdown_signal)
+
     try:
-        uvicorn.run(
-            app,
-            host="0.0.0.0",
-            port=8000,
-            log_level="info",
-        )
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop if uvloop else None) as runner:
+            runner.run(serve_with_scheduler(server))
     except Exception as e:
         logger.error(f"API server error: {e}")
 
@@ -606,28 +900,16 @@ def main() -> None:
     logger.info("=" * 60)
 
     # Initialize global components
-    global db, scheduler, obsidian_writer
-    settings = get_settings()
-    
-    db = Database(settings.database.path)
-    project_vault = settings.obsidian.project_vault or str(Path(settings.data_dir) / "project-vault")
-    personal_vault = settings.obsidian.personal_vault or str(Path(settings.data_dir) / "personal-vault")
-    obsidian_writer = ObsidianWriter(
-        project_vault=str(project_vault),
-        personal_vault=str(personal_vault),
-    )
+    global db
+    db = get_default_db()
+    get_obsidian_writer()
 
     # Set up signal handlers
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
 
-    # Set up and start scheduler
-    scheduler = setup_scheduler()
-    scheduler.start()
-    logger.info("Scheduler started")
-
-    # Start the API server in the main thread
-    # Note: Using threading for scheduler + main thread for API server
+    # Start the API server in the main thread; the scheduler shares its
+    # event loop and is started once the loop is running
     logger.info("Starting API server on http://localhost:8000")
     
     try:
@@ -5,24 +5,120 @@ Handles interaction with OpenRouter API through LangChain for
 processing daily activity batches and generating weekly summaries.
 """
 
+import asyncio
+import hashlib
 import json
 import logging
+import threading
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from typing import List, Dict, Any, Coroutine, Optional, Tuple, TypeVar
 from datetime import datetime
 
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 from langchain_openai import ChatOpenAI
 
+try:
+    import tiktoken
+except ImportError:  # Fall back to estimating ~4 characters per token
+    tiktoken = None
+
 from config.settings import get_settings, get_model_config
-from storage.database import Database, RawEvent, Activity, Entity, Relationship
-from processing.prompts.daily_process import DAILY_PROCESS_PROMPT
+from storage.database import RawEvent, Activity, Entity, Relationship, get_default_db
+from processing.prompts.daily_process import DAILY_PROCESS_CONTEXT, DAILY_PROCESS_INSTRUCTIONS
 from processing.prompts.weekly_synthesis import WEEKLY_SYNTHESIS_PROMPT
 
 logger = logging.getLogger(__name__)
 
+# Retry transient network failures of an LLM request
+llm_retry = retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=1, min=4, max=10),
+    retry=retry_if_exception_type((TimeoutError, ConnectionError)),
+    reraise=True,
+)
+
+# (project name, week's activities, current README) for one weekly synthesis
+WeeklyJob = Tuple[str, List[Activity], str]
+
+T = TypeVar("T")
+
+# The daily prompt's instructions have no placeholders; render them once
+DAILY_INSTRUCTIONS_TEXT = DAILY_PROCESS_INSTRUCTIONS.format()
+
+FALLBACK_ENCODING = "cl100k_base"
+
+
+@lru_cache(maxsize=None)
+def _get_encoding(model: str) -> Optional[Any]:
+    """Get the tiktoken encoding for a model, or None if none can be loaded."""
+    if tiktoken is None:
+        return None
+    try:
+        # OpenRouter model IDs are prefixed with the vendor, e.g. "openai/gpt-4o"
+        return tiktoken.encoding_for_model(model.rsplit("/", 1)[-1])
+    except KeyError:
+        pass
+    except Exception as e:
+        logger.warning(f"Could not load tokenizer for {model}, estimating token counts: {e}")
+        return None
+    try:
+        return tiktoken.get_encoding(FALLBACK_ENCODING)
+    except Exception as e:
+        logger.warning(f"Could not load tokenizer for {model}, estimating token counts: {e}")
+        return None
+
+
+def count_tokens(text: str, model: str) -> int:
+    """
+    Count the tokens in text for a model.
+
+    Uses the model's tiktoken encoding (cl100k_base for unknown models) and
+    falls back to ~4 characters per token when no tokenizer is available.
+
+    Args:
+        text: Text to count
+        model: Model name, optionally vendor-prefixed
+
+    Returns:
+        Token count
+    """
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return len(text) // 4
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+# (name, description, keywords) for each project, hashable for caching
+FrozenProjects = Tuple[Tuple[str, str, Tuple[str, ...]], ...]
+
+
+def _freeze_projects(projects: Dict[str, Dict[str, Any]]) -> FrozenProjects:
+    """Get an immutable projection of the project details used in prompts."""
+    return tuple(
+        (name, details.get("description") or "", tuple(details.get("keywords") or ()))
+        for name, details in projects.items()
+    )
+
+
+@lru_cache(maxsize=8)
+def _format_projects(projects: FrozenProjects) -> str:
+    """
+    Format the existing projects block of the daily prompt.
+
+    The project catalog rarely changes, so the block is built once and
+    reused for every batch until it does.
+    """
+    if not projects:
+        return "No existing projects."
+
+    return "".join(
+        f"{name}|{description}|{','.join(keywords)}\n"
+        for name, description, keywords in projects
+    )
+
 
 @dataclass
 class ProcessingResult:
@@ -74,6 +170,13 @@ class AIProcessor:
         if "openrouter" in base_url.lower():
             logger.info("Using OpenRouter API")
         
+        # OpenAI-style providers cache long prompt prefixes automatically;
+        # Anthropic models (via OpenRouter) need an explicit breakpoint
+        self.mark_cache_breakpoints = (
+            "openrouter" in base_url.lower()
+            and model_config.get("model", "").startswith("anthropic/")
+        )
+        
         self.llm = ChatOpenAI(
             model=model_config.get("model", "gpt-4o-mini"),
             temperature=model_config.get("temperature", 0.3),
@@ -82,16 +185,16 @@ class AIProcessor:
             base_url=base_url if base_url != "https://api.openai.com/v1" else None,
         )
         
+        # Loop for the blocking *_many wrappers; kept for the processor's
+        # lifetime because the async client's pooled connections belong to it
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+        
         logger.info(
             f"AIProcessor initialized with model: {model_config.get('model')}"
         )
     
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception_type((TimeoutError, ConnectionError)),
-        reraise=True,
-    )
+    @llm_retry
     def process_batch(
         self,
         events: List[RawEvent],
@@ -107,70 +210,141 @@ class AIProcessor:
         Returns:
             ProcessingResult with activities, new projects, and tweets
         """
+        try:
+            done, prompt, cache_key = self._start_batch(events, existing_projects)
+            if done is not None:
+                return done
+            response = self.llm.invoke(self._daily_messages(prompt))
+            return self._finish_batch(events, prompt, response.content, cache_key, response.usage_metadata)
+        except Exception as e:
+            return self._batch_error(e)
+    
+    def _daily_messages(self, prompt: str) -> List[BaseMessage]:
+        """
+        Wrap a daily processing prompt in chat messages.
+        
+        When the model needs explicit cache breakpoints, the static
+        instructions go in their own content block marked cacheable.
+        """
+        content: Any = prompt
+        if self.mark_cache_breakpoints and prompt.startswith(DAILY_INSTRUCTIONS_TEXT):
+            content = [
+                {
+                    "type": "text",
+                    "text": DAILY_INSTRUCTIONS_TEXT,
+                    "cache_control": {"type": "ephemeral"},
+                },
+                {"type": "text", "text": prompt[len(DAILY_INSTRUCTIONS_TEXT):]},
+            ]
+        return [
+            SystemMessage(content="You are an expert activity analysis system."),
+            HumanMessage(content=content),
+        ]
+    
+    def _start_batch(
+        self,
+        events: List[RawEvent],
+        existing_projects: Dict[str, Dict[str, Any]],
+    ) -> Tuple[Optional[ProcessingResult], str, str]:
+        """
+        Prepare a batch for the AI call.
+        
+        Returns:
+            Tuple of (result, prompt, cache_key). The result is set when the
+            batch needs no AI call: it is empty, or its response is cached.
+        """
         if not events:
             logger.warning("No events to process")
-            return ProcessingResult(
-                activities=[],
-                new_projects=[],
-                tweets=[],
-                input_tokens=0,
-                output_tokens=0,
-            )
+            return self._empty_result(), "", ""
         
-        try:
-            # Build the prompt
-            prompt = self._build_daily_prompt(events, existing_projects)
-            
-            # Send to AI
-            messages = [
-                SystemMessage(content="You are an expert activity analysis system."),
-                HumanMessage(content=prompt),
-            ]
-            
-            logger.info(f"Processing {len(events)} events with AI")
-            response = self.llm.invoke(messages)
-            
-            # Estimate tokens (actual counts may vary)
-            input_tokens = len(prompt) // 4
-            output_tokens = len(response.content) // 4
-            
-            # Parse the response
-            result = self._parse_response(response.content)
-            result.input_tokens = input_tokens
-            result.output_tokens = output_tokens
-
-            logger.info(
-                f"Processed {len(events)} events into "
-                f"{len(result.activities)} activities, "
-                f"{len(result.new_projects)} new projects, "
-                f"{len(result.new_entities)} new entities, "
-                f"{len(result.entity_relationships)} relationships"
-            )
+        prompt = self._build_daily_prompt(events, existing_projects)
+        
+        cache_key = self._cache_key("daily_process", prompt)
+        cached = self._get_cached_response(cache_key)
+        if cached is not None:
+            logger.info(f"Using cached AI response for {len(events)} events")
+            return self._finish_batch(events, prompt, cached), prompt, cache_key
+        
+        logger.info(f"Processing {len(events)} events with AI")
+        return None, prompt, cache_key
+    
+    def _batch_error(self, error: Exception) -> ProcessingResult:
+        """Log a batch that failed and return its failed result."""
+        logger.error(f"Error processing batch: {error}")
+        return self._failed_result(str(error))
+    
+    def _finish_batch(
+        self,
+        events: List[RawEvent],
+        prompt: str,
+        content: str,
+        cache_key: Optional[str] = None,
+        usage: Optional[Dict[str, Any]] = None,
+    ) -> ProcessingResult:
+        """
+        Parse a batch response, then store its entities.
+        
+        A fresh response (one with a cache_key) also has its usage recorded
+        and, if it parsed, is cached; a cached response cost no tokens, so
+        it reports none.
+        """
+        if cache_key is None:
+            input_tokens = output_tokens = 0
+        else:
+            input_tokens, output_tokens = self._token_counts(prompt, content, usage)
+        
+        # Parse the response
+        result = self._parse_response(content)
+        result.input_tokens = input_tokens
+        result.output_tokens = output_tokens
+
+        logger.info(
+            f"Processed {len(events)} events into "
+            f"{len(result.activities)} activities, "
+            f"{len(result.new_projects)} new projects, "
+            f"{len(result.new_entities)} new entities, "
+            f"{len(result.entity_relationships)} relationships"
+        )
 
-            # Store entities and relationships (activities will be stored separately)
-            if result.new_entities or result.entity_relationships:
-                try:
-                    self._store_entities_and_relationships(result, {})
-                except Exception as store_error:
-                    logger.error(f"Error storing entities/relationships: {store_error}")
-                    # Don't fail the whole batch if entity storage fails
+        # Store entities and relationships (activities will be stored separately)
+        if result.new_entities or result.entity_relationships:
+            try:
+                self._store_entities_and_relationships(result, {})
+            except Exception as store_error:
+                logger.error(f"Error storing entities/relationships: {store_error}")
+                # Don't fail the whole batch if entity storage fails
 
+        if cache_key is not None:
             # Record token usage
             self._record_usage("daily_process", input_tokens, output_tokens)
+            if result.success:
+                self._cache_response(cache_key, "daily_process", content)
 
-            return result
-            
-        except Exception as e:
-            logger.error(f"Error processing batch: {e}")
-            return ProcessingResult(
-                activities=[],
-                new_projects=[],
-                tweets=[],
-                input_tokens=0,
-                output_tokens=0,
-                success=False,
-                error_message=str(e),
-            )
+        return result
+    
+    @staticmethod
+    def _empty_result() -> ProcessingResult:
+        """Result for a batch with nothing to process."""
+        return ProcessingResult(
+            activities=[],
+            new_projects=[],
+            tweets=[],
+            input_tokens=0,
+            output_tokens=0,
+        )
+    
+    @staticmethod
+    def _failed_result(error_message: str) -> ProcessingResult:
+        """Result for a batch that could not be processed."""
+        return ProcessingResult(
+            activities=[],
+            new_projects=[],
+            tweets=[],
+            input_tokens=0,
+            output_tokens=0,
+            success=False,
+            error_message=error_message,
+        )
     
     def weekly_synthesis(
         self,
@@ -193,39 +367,191 @@ class AIProcessor:
         Returns:
             Markdown string with weekly summary
         """
+        try:
+            done, prompt, cache_key = self._start_weekly(
+                project_name, activities, current_readme, project_entities, related_context
+            )
+            if done is not None:
+                return done
+            response = self.llm.invoke(self._weekly_messages(prompt))
+            return self._finish_weekly(prompt, response.content, cache_key, response.usage_metadata)
+        except Exception as e:
+            return self._weekly_error(project_name, e)
+    
+    async def aweekly_synthesis(
+        self,
+        project_name: str,
+        activities: List[Activity],
+        current_readme: str,
+        project_entities: str = "",
+        related_context: str = "",
+    ) -> str:
+        """Like weekly_synthesis, but awaits the AI instead of blocking on it."""
+        try:
+            done, prompt, cache_key = self._start_weekly(
+                project_name, activities, current_readme, project_entities, related_context
+            )
+            if done is not None:
+                return done
+            response = await self.llm.ainvoke(self._weekly_messages(prompt))
+            return self._finish_weekly(prompt, response.content, cache_key, response.usage_metadata)
+        except Exception as e:
+            return self._weekly_error(project_name, e)
+    
+    async def aweekly_synthesis_many(self, jobs: List[WeeklyJob]) -> List[str]:
+        """
+        Generate weekly summaries for several projects concurrently.
+        
+        At most openai.max_concurrency requests are in flight at once.
+        
+        Args:
+            jobs: (project name, activities, current README) per project
+            
+        Returns:
+            Markdown summaries, in the same order as jobs
+        """
+        semaphore = asyncio.Semaphore(self.settings.openai.max_concurrency)
+        
+        async def run(job: WeeklyJob) -> str:
+            project_name, activities, current_readme = job
+            async with semaphore:
+                return await self.aweekly_synthesis(
+                    project_name=project_name,
+                    activities=activities,
+                    current_readme=current_readme,
+                )
+        
+        return await asyncio.gather(*(run(job) for job in jobs))
+    
+    def weekly_synthesis_many(self, jobs: List[WeeklyJob]) -> List[str]:
+        """Blocking wrapper around aweekly_synthesis_many for synchronous callers."""
+        return self._run(self.aweekly_synthesis_many(jobs))
+    
+    def _run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Run a coroutine to completion on the processor's event loop."""
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+            return self._loop.run_until_complete(coro)
+    
+    def _weekly_messages(self, prompt: str) -> List[BaseMessage]:
+        """Wrap a weekly synthesis prompt in chat messages."""
+        return [
+            SystemMessage(content="You are an expert technical writer."),
+            HumanMessage(content=prompt),
+        ]
+    
+    def _start_weekly(
+        self,
+        project_name: str,
+        activities: List[Activity],
+        current_readme: str,
+        project_entities: str,
+        related_context: str,
+    ) -> Tuple[Optional[str], str, str]:
+        """
+        Prepare a weekly synthesis for the AI call.
+        
+        Returns:
+            Tuple of (summary, prompt, cache_key). The summary is set when no
+            AI call is needed: there are no activities, or it is cached.
+        """
         if not activities:
             logger.warning(f"No activities for {project_name} weekly synthesis")
-            return f"## Week of {datetime.now().strftime('%b %d, %Y')}\n\nNo recorded activities this week."
-
+            return f"## Week of {datetime.now().strftime('%b %d, %Y')}\n\nNo recorded activities this week.", "", ""
+        
+        # Build the prompt with entity context
+        prompt = self._build_weekly_prompt(
+            project_name=project_name,
+            activities=activities,
+            current_readme=current_readme,
+            project_entities=project_entities,
+            related_context=related_context,
+        )
+        
+        cache_key = self._cache_key("weekly_synthesis", prompt)
+        cached = self._get_cached_response(cache_key)
+        if cached is not None:
+            logger.info(f"Using cached weekly synthesis for {project_name}")
+            return cached, prompt, cache_key
+        
+        logger.info(f"Generating weekly synthesis for {project_name}")
+        return None, prompt, cache_key
+    
+    @staticmethod
+    def _weekly_error(project_name: str, error: Exception) -> str:
+        """Log a weekly synthesis that failed and return its placeholder summary."""
+        logger.error(f"Error generating weekly synthesis for {project_name}: {error}")
+        return f"## Week of {datetime.now().strftime('%b %d, %Y')}\n\nError generating summary: {error}"
+    
+    def _finish_weekly(
+        self,
+        prompt: str,
+        content: str,
+        cache_key: str,
+        usage: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Record a fresh weekly summary's token usage, cache it and return it."""
+        input_tokens, output_tokens = self._token_counts(prompt, content, usage)
+        self._record_usage("weekly_synthesis", input_tokens, output_tokens)
+        self._cache_response(cache_key, "weekly_synthesis", content)
+        return content
+    
+    def _token_counts(
+        self,
+        prompt: str,
+        content: str,
+        usage: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[int, int]:
+        """
+        Get a request's (input, output) token counts.
+        
+        Uses the counts the API reported when available, otherwise counts
+        the prompt and response text with the model's tokenizer. The prompt
+        count excludes the few tokens of chat message framing.
+        """
+        if usage:
+            return usage["input_tokens"], usage["output_tokens"]
+        model = self.model_config.get("model", "")
+        return count_tokens(prompt, model), count_tokens(content, model)
+    
+    def _cache_key(self, operation: str, prompt: str) -> str:
+        """
+        Key a response by model, operation and prompt.
+        
+        Runs of whitespace are collapsed first, so formatting-only
+        differences in the prompt still hit the cache.
+        """
+        normalized = " ".join(prompt.split())
+        model = self.model_config.get("model", "unknown")
+        return hashlib.sha256(f"{model}\0{operation}\0{normalized}".encode()).hexdigest()
+    
+    def _get_cached_response(self, cache_key: str) -> Optional[str]:
+        """Get a cached response, or None on a miss or when caching is off."""
+        ttl_hours = self.settings.openai.cache_ttl_hours
+        if ttl_hours <= 0:
+            return None
+        try:
+            return get_default_db().get_cached_response(cache_key, ttl_hours)
+        except Exception as e:
+            logger.warning(f"Error reading response cache: {e}")
+            return None
+    
+    def _cache_response(self, cache_key: str, operation: str, content: str) -> None:
+        """Store a response in the cache, unless caching is off."""
+        ttl_hours = self.settings.openai.cache_ttl_hours
+        if ttl_hours <= 0:
+            return
         try:
-            # Build the prompt with entity context
-            prompt = self._build_weekly_prompt(
-                project_name=project_name,
-                activities=activities,
-                current_readme=current_readme,
-                project_entities=project_entities,
-                related_context=related_context,
+            get_default_db().cache_response(
+                cache_key,
+                operation,
+                self.model_config.get("model", "unknown"),
+                content,
+                ttl_hours,
             )
-            
-            # Send to AI
-            messages = [
-                SystemMessage(content="You are an expert technical writer."),
-                HumanMessage(content=prompt),
-            ]
-            
-            logger.info(f"Generating weekly synthesis for {project_name}")
-            response = self.llm.invoke(messages)
-            
-            # Estimate and record token usage
-            input_tokens = len(prompt) // 4
-            output_tokens = len(response.content) // 4
-            self._record_usage("weekly_synthesis", input_tokens, output_tokens)
-            
-            return response.content
-            
         except Exception as e:
-            logger.error(f"Error generating weekly synthesis for {project_name}: {e}")
-            return f"## Week of {datetime.now().strftime('%b %d, %Y')}\n\nError generating summary: {e}"
+            logger.warning(f"Error writing response cache: {e}")
     
     def _build_weekly_prompt(
         self,
@@ -248,11 +574,11 @@ class AIProcessor:
         Returns:
             Formatted prompt string
         """
-        # Build activities string
-        activities_str = ""
-        for activity in activities:
-            activities_str += f"- [{activity.activity_type}] {activity.description}\n"
-            activities_str += f"  Date: {activity.timestamp[:10]}\n"
+        # Build activities string, one formatted entry per activity
+        activities_str = "".join(
+            f"- [{activity.activity_type}] {activity.description}\n  Date: {activity.timestamp[:10]}\n"
+            for activity in activities
+        )
 
         # Format the prompt with entity context
         return WEEKLY_SYNTHESIS_PROMPT.format(
@@ -299,22 +625,11 @@ class AIProcessor:
         Returns:
             Formatted prompt string
         """
-        # Format existing projects
-        projects_str = ""
-        if projects:
-            for name, details in projects.items():
-                projects_str += f"- {name}"
-                if details.get("description"):
-                    projects_str += f": {details['description']}"
-                if details.get("keywords"):
-                    projects_str += f" [keywords: {', '.join(details['keywords'])}]"
-                projects_str += "\n"
-        else:
-            projects_str = "No existing projects."
+        projects_str = _format_projects(_freeze_projects(projects))
 
         # Retrieve and format entity context
         try:
-            db = Database()
+            db = get_default_db()
             recent_entities = db.get_recent_entities(days=30, limit=50)
             recent_relationships = db.get_recent_relationships(days=30, limit=30)
             entities_str = self._format_entities(recent_entities)
@@ -325,13 +640,13 @@ class AIProcessor:
             relationships_str = "No existing relationships."
 
         # Format events
-        events_str = ""
-        for event in events:
-            events_str += f"[{event.source}/{event.event_type}] {event.event_time}\n"
-            events_str += f"{event.raw_data}\n"
-            events_str += "---\n"
+        events_str = "".join(
+            f"{event.event_time}\t{event.source}/{event.event_type}\t{event.raw_data}\n"
+            for event in events
+        )
 
-        return DAILY_PROCESS_PROMPT.format(
+        # Static instructions first, so the prefix is identical between batches
+        return DAILY_INSTRUCTIONS_TEXT + DAILY_PROCESS_CONTEXT.format(
             existing_projects=projects_str,
             existing_entities=entities_str,
             recent_relationships=relationships_str,
@@ -415,7 +730,7 @@ class AIProcessor:
             entity_id_map: Dictionary mapping entity names to IDs
         """
         try:
-            db = Database(self.settings.database.path)
+            db = get_default_db()
             
             # Store new entities
             if result.new_entities:
@@ -492,7 +807,7 @@ class AIProcessor:
             output_tokens: Number of output tokens
         """
         try:
-            db = Database()
+            db = get_default_db()
             
             # Rough cost estimate (varies by model)
             # Using approximate rates for gpt-4o-mini
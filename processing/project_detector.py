@@ -54,6 +54,12 @@ class ProjectDetector:
         Returns:
             True if project should be created, False otherwise
         """
+        # Fast path: an existing project is never re-created, and would
+        # otherwise only be rejected after the checks below
+        if project_name in self.settings.projects:
+            logger.debug(f"Project '{project_name}' rejected: already exists")
+            return False
+        
         # Rule 1: Must have at least 3 activities
         if len(activities) < 3:
             logger.debug(
@@ -1,9 +1,15 @@
 """Prompt templates for AI processing."""
 
-from processing.prompts.daily_process import DAILY_PROCESS_PROMPT
+from processing.prompts.daily_process import (
+    DAILY_PROCESS_CONTEXT,
+    DAILY_PROCESS_INSTRUCTIONS,
+    DAILY_PROCESS_PROMPT,
+)
 from processing.prompts.weekly_synthesis import WEEKLY_SYNTHESIS_PROMPT
 
 __all__ = [
+    "DAILY_PROCESS_CONTEXT",
+    "DAILY_PROCESS_INSTRUCTIONS",
     "DAILY_PROCESS_PROMPT",
     "WEEKLY_SYNTHESIS_PROMPT",
 ]
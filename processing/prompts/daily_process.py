@@ -5,19 +5,9 @@ This prompt instructs the AI to analyze raw events and group them into meaningfu
 categorizing them under existing or new projects, and extracting entities with relationships.
 """
 
-DAILY_PROCESS_PROMPT = """You are an intelligent activity analysis system with entity extraction capabilities. Your task is to analyze a batch of raw events from various sources (GitHub, Gmail, Calendar) and group them into meaningful activities, extracting rich entities and their relationships.
-
-EXISTING PROJECTS:
-{existing_projects}
-
-EXISTING ENTITIES (match case-insensitively):
-{existing_entities}
-
-RECENT RELATIONSHIPS:
-{recent_relationships}
-
-RAW EVENTS TO ANALYZE:
-{events}
+# Static instructions come first and are identical on every call, so
+# providers that cache prompt prefixes can reuse them between batches
+DAILY_PROCESS_INSTRUCTIONS = """You are an intelligent activity analysis system with entity extraction capabilities. Your task is to analyze a batch of raw events from various sources (GitHub, Gmail, Calendar) and group them into meaningful activities, extracting rich entities and their relationships. The existing projects, entities, relationships and raw events to analyze follow these instructions.
 
 TASK INSTRUCTIONS:
 
@@ -164,4 +154,21 @@ GUIDELINES:
 - If no tweet-worthy content, omit the tweet_draft field
 
 IMPORTANT: Be conservative with new project creation. Only create a new project when there are 3+ related activities across multiple days, or the work clearly represents a major new initiative distinct from all existing projects.
+
 """
+
+# Per-batch context, appended after the instructions
+DAILY_PROCESS_CONTEXT = """EXISTING PROJECTS (one per line: name|description|comma-separated keywords):
+{existing_projects}
+
+EXISTING ENTITIES (match case-insensitively):
+{existing_entities}
+
+RECENT RELATIONSHIPS:
+{recent_relationships}
+
+RAW EVENTS TO ANALYZE (one per line: time<TAB>source/event_type<TAB>raw data):
+{events}
+"""
+
+DAILY_PROCESS_PROMPT = DAILY_PROCESS_INSTRUCTIONS + DAILY_PROCESS_CONTEXT
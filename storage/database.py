@@ -5,11 +5,29 @@ Handles all CRUD operations and table management.
 
 import sqlite3
 import json
+from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Set, Tuple
 from dataclasses import dataclass
 
+from config.settings import get_settings
+
+
+# Key in raw_data holding each source's own ID for an event
+EXTERNAL_ID_KEYS = {
+    "gmail": "message_id",
+    "youtube": "video_id",
+}
+
+# Stay below SQLite's default limit on bound parameters
+MAX_QUERY_PARAMS = 500
+
+# Upper bound on how much of the database file SQLite may memory-map
+MMAP_SIZE_BYTES = 256 * 1024 * 1024
+
 
 @dataclass
 class RawEvent:
@@ -98,6 +116,11 @@ class Database:
         """Get a database connection with row factory."""
         conn = sqlite3.connect(self.db_path)
         conn.row_factory = sqlite3.Row
+        # Safe with WAL: a crash can only lose the last commits, not corrupt
+        conn.execute("PRAGMA synchronous=NORMAL")
+        # Keep sort/grouping temp tables off disk and read pages via mmap
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute(f"PRAGMA mmap_size={MMAP_SIZE_BYTES}")
         return conn
     
     def _init_tables(self) -> None:
@@ -105,6 +128,10 @@ class Database:
         conn = self._get_connection()
         cursor = conn.cursor()
         
+        # WAL lets readers (API, CLI) run while collectors write; it is
+        # persistent, so setting it once here covers every later connection
+        cursor.execute("PRAGMA journal_mode=WAL")
+        
         # Raw events table
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS raw_events (
@@ -192,6 +219,18 @@ class Database:
             )
         """)
         
+        # LLM responses keyed by a hash of model, operation and prompt
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                cache_key TEXT PRIMARY KEY,
+                operation TEXT NOT NULL,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                hit_count INTEGER DEFAULT 0
+            )
+        """)
+        
         # Entities table for graph system
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS entities (
@@ -241,6 +280,11 @@ class Database:
             CREATE INDEX IF NOT EXISTS idx_raw_events_time 
             ON raw_events(event_time)
         """)
+        for source, key in EXTERNAL_ID_KEYS.items():
+            cursor.execute(f"""
+                CREATE INDEX IF NOT EXISTS idx_raw_events_{source}_id
+                ON raw_events(source, json_extract(raw_data, '$.{key}'))
+            """)
         cursor.execute("""
             CREATE INDEX IF NOT EXISTS idx_activities_project 
             ON activities(project_name)
@@ -281,6 +325,29 @@ class Database:
         """Normalize entity name: lowercase and replace spaces with hyphens."""
         return name.lower().strip().replace(" ", "-")
 
+    @staticmethod
+    def _row_to_entity(row: sqlite3.Row) -> Entity:
+        """Build an Entity from a row, decoding its metadata JSON once."""
+        metadata = row["metadata"]
+        if not metadata:
+            metadata = None
+        elif metadata == "{}":
+            # Column default; skip the JSON parse
+            metadata = {}
+        else:
+            metadata = json.loads(metadata)
+
+        return Entity(
+            id=row["id"],
+            entity_type=row["entity_type"],
+            name=row["name"],
+            display_name=row["display_name"],
+            metadata=metadata,
+            first_seen=row["first_seen"],
+            last_seen=row["last_seen"],
+            mention_count=row["mention_count"],
+        )
+
     def get_or_create_entity(
         self,
         name: str,
@@ -408,16 +475,7 @@ class Database:
             row = cursor.fetchone()
             
             if row:
-                return Entity(
-                    id=row["id"],
-                    entity_type=row["entity_type"],
-                    name=row["name"],
-                    display_name=row["display_name"],
-                    metadata=json.loads(row["metadata"]) if row["metadata"] else None,
-                    first_seen=row["first_seen"],
-                    last_seen=row["last_seen"],
-                    mention_count=row["mention_count"],
-                )
+                return self._row_to_entity(row)
             
             return None
 
@@ -462,16 +520,7 @@ class Database:
             rows = cursor.fetchall()
             
             return [
-                Entity(
-                    id=row["id"],
-                    entity_type=row["entity_type"],
-                    name=row["name"],
-                    display_name=row["display_name"],
-                    metadata=json.loads(row["metadata"]) if row["metadata"] else None,
-                    first_seen=row["first_seen"],
-                    last_seen=row["last_seen"],
-                    mention_count=row["mention_count"],
-                )
+                self._row_to_entity(row)
                 for row in rows
             ]
 
@@ -508,16 +557,7 @@ class Database:
             rows = cursor.fetchall()
             
             return [
-                Entity(
-                    id=row["id"],
-                    entity_type=row["entity_type"],
-                    name=row["name"],
-                    display_name=row["display_name"],
-                    metadata=json.loads(row["metadata"]) if row["metadata"] else None,
-                    first_seen=row["first_seen"],
-                    last_seen=row["last_seen"],
-                    mention_count=row["mention_count"],
-                )
+                self._row_to_entity(row)
                 for row in rows
             ]
 
@@ -554,16 +594,7 @@ class Database:
             rows = cursor.fetchall()
             
             return [
-                Entity(
-                    id=row["id"],
-                    entity_type=row["entity_type"],
-                    name=row["name"],
-                    display_name=row["display_name"],
-                    metadata=json.loads(row["metadata"]) if row["metadata"] else None,
-                    first_seen=row["first_seen"],
-                    last_seen=row["last_seen"],
-                    mention_count=row["mention_count"],
-                )
+                self._row_to_entity(row)
                 for row in rows
             ]
 
@@ -630,7 +661,7 @@ class Database:
         return event_id if event_id is not None else 0
     
     def insert_events(self, events: List[Tuple[str, str, str, str]]) -> int:
-        """Insert multiple raw events. Returns number of events inserted."""
+        """Insert multiple raw events in one transaction. Returns number of events inserted."""
         if not events:
             return 0
         
@@ -648,6 +679,39 @@ class Database:
         
         return inserted
     
+    def get_known_external_ids(self, source: str, external_ids: List[str]) -> Set[str]:
+        """Return which of the given source IDs are already stored as raw events.
+        
+        Args:
+            source: Event source with an entry in EXTERNAL_ID_KEYS
+            external_ids: Source-specific IDs (e.g. Gmail message IDs)
+            
+        Returns:
+            Subset of external_ids that already have a raw event
+        """
+        key = EXTERNAL_ID_KEYS[source]
+        known: Set[str] = set()
+        if not external_ids:
+            return known
+        
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        for start in range(0, len(external_ids), MAX_QUERY_PARAMS):
+            chunk = external_ids[start:start + MAX_QUERY_PARAMS]
+            placeholders = ",".join(["?"] * len(chunk))
+            cursor.execute(f"""
+                SELECT json_extract(raw_data, '$.{key}') AS external_id
+                FROM raw_events
+                WHERE source = ?
+                AND json_extract(raw_data, '$.{key}') IN ({placeholders})
+            """, [source, *chunk])
+            known.update(row["external_id"] for row in cursor.fetchall())
+        
+        conn.close()
+        
+        return known
+    
     def get_unprocessed_events(self, limit: int = 100) -> List[RawEvent]:
         """Get unprocessed events for batch processing."""
         conn = self._get_connection()
@@ -707,6 +771,40 @@ class Database:
             for row in rows
         ]
     
+    def get_event_counts(self, since: datetime) -> Dict[str, Any]:
+        """Count events since a datetime without loading their payloads.
+        
+        Args:
+            since: Start of the window (inclusive, by event time).
+            
+        Returns:
+            Dict with "total" and "unprocessed" counts and a per-source
+            "by_source" breakdown.
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT source, COUNT(*) AS total, SUM(processed = 0) AS unprocessed
+                FROM raw_events
+                WHERE event_time >= ?
+                GROUP BY source
+            """, (since.isoformat(),))
+            rows = cursor.fetchall()
+        
+        by_source = {row["source"]: row["total"] for row in rows}
+        return {
+            "total": sum(by_source.values()),
+            "unprocessed": sum(row["unprocessed"] for row in rows),
+            "by_source": by_source,
+        }
+    
+    def count_unprocessed_events(self) -> int:
+        """Count events waiting for batch processing."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(*) FROM raw_events WHERE processed = 0")
+            return cursor.fetchone()[0]
+    
     def mark_events_processed(self, event_ids: List[int]) -> int:
         """Mark events as processed. Returns number of events updated."""
         if not event_ids:
@@ -809,6 +907,37 @@ class Database:
         
         return activity_id if activity_id is not None else 0
     
+    def insert_activities(self, activities: List[Tuple[str, str, str, str, str, str]]) -> List[int]:
+        """Insert multiple activities in one transaction.
+        
+        Args:
+            activities: (timestamp, project_name, activity_type, description,
+                source_refs, raw_event_ids) tuples.
+            
+        Returns:
+            IDs of the inserted activities, in input order.
+        """
+        if not activities:
+            return []
+        
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        # executemany can't report per-row IDs; one commit is what matters
+        activity_ids = []
+        for activity in activities:
+            cursor.execute("""
+                INSERT INTO activities 
+                (timestamp, project_name, activity_type, description, source_refs, raw_event_ids)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, activity)
+            activity_ids.append(cursor.lastrowid or 0)
+        
+        conn.commit()
+        conn.close()
+        
+        return activity_ids
+    
     def get_activities_for_period(
         self,
         start: datetime,
@@ -842,21 +971,55 @@ class Database:
         rows = cursor.fetchall()
         conn.close()
         
-        return [
-            Activity(
-                id=row["id"],
-                timestamp=row["timestamp"],
-                project_name=row["project_name"],
-                activity_type=row["activity_type"],
-                description=row["description"],
-                source_refs=row["source_refs"],
-                tweet_draft_id=row["tweet_draft_id"],
-                raw_event_ids=row["raw_event_ids"],
-                embedding=row["embedding"],
-                created_at=row["created_at"],
-            )
-            for row in rows
-        ]
+        return [self._row_to_activity(row) for row in rows]
+    
+    def get_activities_by_project(
+        self,
+        start: datetime,
+        end: datetime,
+    ) -> Dict[str, List[Activity]]:
+        """Get activities within a time period grouped by project.
+        
+        Uses one query ordered by project instead of one query per project.
+        
+        Args:
+            start: Start of the period.
+            end: End of the period.
+            
+        Returns:
+            Dictionary mapping project name to its activities, newest first.
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT id, timestamp, project_name, activity_type, description, 
+                       source_refs, tweet_draft_id, raw_event_ids, embedding, created_at
+                FROM activities
+                WHERE timestamp >= ? AND timestamp <= ?
+                ORDER BY project_name, timestamp DESC
+            """, (start.isoformat(), end.isoformat()))
+            rows = cursor.fetchall()
+        
+        return {
+            project_name: [self._row_to_activity(row) for row in project_rows]
+            for project_name, project_rows in groupby(rows, key=itemgetter("project_name"))
+        }
+    
+    @staticmethod
+    def _row_to_activity(row: sqlite3.Row) -> Activity:
+        """Build an Activity from a row."""
+        return Activity(
+            id=row["id"],
+            timestamp=row["timestamp"],
+            project_name=row["project_name"],
+            activity_type=row["activity_type"],
+            description=row["description"],
+            source_refs=row["source_refs"],
+            tweet_draft_id=row["tweet_draft_id"],
+            raw_event_ids=row["raw_event_ids"],
+            embedding=row["embedding"],
+            created_at=row["created_at"],
+        )
     
     def get_or_create_project(self, name: str, description: str = "", keywords: str = "") -> Tuple[int, bool]:
         """
@@ -910,6 +1073,36 @@ class Database:
         
         return draft_id if draft_id is not None else 0
     
+    def insert_tweet_drafts(self, drafts: List[Tuple[str, str, str, str]]) -> List[int]:
+        """Insert multiple tweet drafts in one transaction.
+        
+        Args:
+            drafts: (content, project_name, activity_ids, timestamp) tuples.
+            
+        Returns:
+            IDs of the inserted drafts, in input order.
+        """
+        if not drafts:
+            return []
+        
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        generated_at = datetime.now().isoformat()
+        
+        draft_ids = []
+        for content, project_name, activity_ids, timestamp in drafts:
+            cursor.execute("""
+                INSERT INTO tweet_drafts (content, project_name, activity_ids, timestamp, generated_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, (content, project_name, activity_ids, timestamp, generated_at))
+            draft_ids.append(cursor.lastrowid or 0)
+        
+        conn.commit()
+        conn.close()
+        
+        return draft_ids
+    
     def get_token_stats(self, days: int = 30) -> Dict[str, Any]:
         """Get token usage statistics for the specified period."""
         conn = self._get_connection()
@@ -999,3 +1192,57 @@ class Database:
         
         conn.commit()
         conn.close()
+    
+    def get_cached_response(self, cache_key: str, ttl_hours: int) -> Optional[str]:
+        """Get a cached LLM response younger than the TTL, counting the hit.
+        
+        Args:
+            cache_key: Key the response was stored under.
+            ttl_hours: Maximum age of the entry in hours.
+            
+        Returns:
+            The cached response text, or None on a miss.
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                UPDATE llm_cache SET hit_count = hit_count + 1
+                WHERE cache_key = ? AND created_at >= datetime('now', ?)
+                RETURNING response
+            """, (cache_key, f"-{ttl_hours} hours"))
+            row = cursor.fetchone()
+        
+        return row["response"] if row else None
+    
+    def cache_response(
+        self,
+        cache_key: str,
+        operation: str,
+        model: str,
+        response: str,
+        ttl_hours: int,
+    ) -> None:
+        """Store an LLM response and drop entries older than the TTL.
+        
+        Args:
+            cache_key: Key to store the response under.
+            operation: Type of operation that produced it.
+            model: Model that produced it.
+            response: Response text.
+            ttl_hours: Maximum age of entries in hours.
+        """
+        with self._get_connection() as conn:
+            conn.execute(
+                "DELETE FROM llm_cache WHERE created_at < datetime('now', ?)",
+                (f"-{ttl_hours} hours",),
+            )
+            conn.execute("""
+                INSERT OR REPLACE INTO llm_cache (cache_key, operation, model, response)
+                VALUES (?, ?, ?, ?)
+            """, (cache_key, operation, model, response))
+
+
+@lru_cache(maxsize=1)
+def get_default_db() -> Database:
+    """Get the shared Database for the configured path, creating tables once."""
+    return Database(get_settings().database.path)
@@ -4,15 +4,42 @@ Handles writing activity logs, README updates, and tweet drafts to Obsidian vaul
 """
 
 import logging
+import os
 import re
+from dataclasses import dataclass
 from datetime import datetime
+from itertools import chain, groupby
+from operator import itemgetter
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
 
 from storage.database import Entity
 
 logger = logging.getLogger(__name__)
 
+# Entity types that get tags, README sections and their own notes
+LINKED_ENTITY_TYPES = frozenset({"technology", "concept"})
+
+NON_KEBAB_CHARS = re.compile(r"[^a-zA-Z0-9-]")
+
+# Write buffer for vault notes; a note up to this size reaches disk in one write
+WRITE_BUFFER_BYTES = 1024 * 1024
+
+
+@dataclass(slots=True)
+class ActivityRow:
+    """A processed activity ready to be written to an activity log."""
+    id: int
+    date: str
+    description: str
+    type: str
+    technologies: List[str]
+    project: str
+
+
+# Activity log entries: ActivityRow, or a dict with the same keys
+ActivityItem = Union[ActivityRow, Dict[str, Any]]
+
 
 class ObsidianWriter:
     """Writes activity data to Obsidian vaults in Markdown format."""
@@ -27,6 +54,8 @@ class ObsidianWriter:
         """
         self.project_vault = Path(project_vault)
         self.personal_vault = Path(personal_vault)
+        # Project name -> folder path; names repeat on every write
+        self._project_folders: Dict[str, Path] = {}
         self._ensure_vaults_exist()
 
     def _ensure_vaults_exist(self) -> None:
@@ -40,27 +69,25 @@ class ObsidianWriter:
         # Replace spaces and underscores with hyphens
         name = name.replace(" ", "-").replace("_", "-")
         # Remove any non-alphanumeric characters except hyphens
-        name = re.sub(r"[^a-zA-Z0-9-]", "", name)
+        name = NON_KEBAB_CHARS.sub("", name)
         # Convert to lowercase
         return name.lower()
 
-    def _format_activity_with_links(self, description: str, entity_map: Dict[str, Entity]) -> str:
+    def _build_link_patterns(self, entity_map: Dict[str, Entity]) -> List[Tuple[re.Pattern[str], str]]:
         """
-        Replace entity names in description with wiki-links.
+        Compile the wiki-link substitutions for an entity map.
+
+        Built once per log and reused for every activity description.
 
         Args:
-            description: The activity description
             entity_map: Dictionary mapping lowercase entity names to Entity objects
 
         Returns:
-            Description with entity names replaced by wiki-links
+            (pattern, wiki-link) pairs, longest entity names first
         """
-        if not entity_map:
-            return description
-
         # Sort entities by name length (descending) to avoid partial matches
         sorted_entities = sorted(entity_map.items(), key=lambda x: len(x[0]), reverse=True)
-        result = description
+        link_patterns: List[Tuple[re.Pattern[str], str]] = []
 
         for entity_name_lower, entity in sorted_entities:
             # Create wiki-link format
@@ -72,11 +99,64 @@ class ObsidianWriter:
             # Use word boundary regex for whole word matching
             # Escape special regex characters in entity name
             escaped_name = re.escape(entity.name)
-            pattern = rf'\b{escaped_name}\b'
-            result = re.sub(pattern, wiki_link, result, flags=re.IGNORECASE)
+            pattern = re.compile(rf'\b{escaped_name}\b', re.IGNORECASE)
+            link_patterns.append((pattern, wiki_link))
+
+        return link_patterns
+
+    def _format_activity_with_links(
+        self,
+        description: str,
+        link_patterns: List[Tuple[re.Pattern[str], str]],
+    ) -> str:
+        """
+        Replace entity names in description with wiki-links.
+
+        Args:
+            description: The activity description
+            link_patterns: Substitutions from _build_link_patterns
 
+        Returns:
+            Description with entity names replaced by wiki-links
+        """
+        result = description
+        for pattern, wiki_link in link_patterns:
+            result = pattern.sub(wiki_link, result)
         return result
 
+    @staticmethod
+    def _write_lines(path: Path, lines: Iterable[str]) -> None:
+        """
+        Replace a vault file with newline-joined lines and an atomic rename.
+
+        Lines are streamed into a temporary file rather than joined in
+        memory first; the large write buffer means a typical note still
+        reaches disk in a single write on close. The temporary file is hidden (dot-prefixed) so Obsidian
+        doesn't index it, and Obsidian and sync clients watching the vault
+        never see a partially written note.
+        """
+        lines = iter(lines)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        with open(tmp_path, "w", encoding="utf-8", newline="", buffering=WRITE_BUFFER_BYTES) as f:
+            f.write(next(lines, ""))
+            f.writelines(f"\n{line}" for line in lines)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def _write_file(cls, path: Path, content: str) -> None:
+        """Replace a vault file with already built content, atomically."""
+        cls._write_lines(path, (content,))
+
+    @staticmethod
+    def _item_date(item: ActivityItem) -> str:
+        """Get an activity or tweet's date, slicing its timestamp only when no date is set."""
+        if isinstance(item, ActivityRow):
+            return item.date
+        date = item.get("date")
+        if date is None:
+            date = item.get("timestamp", "")[:10]
+        return date
+
     def _format_frontmatter(self, data: Dict[str, Any]) -> str:
         """Format a dictionary as YAML frontmatter."""
         lines = ["---"]
@@ -94,6 +174,65 @@ class ObsidianWriter:
         lines.append("---")
         return "\n".join(lines)
 
+    def _iter_activity_lines(
+        self,
+        activities: List[ActivityItem],
+        entity_map: Optional[Dict[str, Entity]] = None,
+        include_technologies: bool = False,
+    ) -> Iterator[str]:
+        """
+        Yield markdown lines for activities grouped by date, newest first.
+
+        Args:
+            activities: List of activity rows or dictionaries
+            entity_map: Optional entity lookup for wiki-links
+            include_technologies: Whether to list each activity's technologies
+
+        Yields:
+            Lines of the activity section, without trailing newlines
+        """
+        dated = [
+            (date, activity)
+            for activity in activities
+            if (date := self._item_date(activity))
+        ]
+        # Newest date first; the sort is stable, so each day keeps its order
+        dated.sort(key=itemgetter(0), reverse=True)
+        link_patterns = self._build_link_patterns(entity_map) if entity_map else None
+
+        for date, day in groupby(dated, key=itemgetter(0)):
+            yield f"## {date}"
+            yield ""
+
+            for _, activity in day:
+                if isinstance(activity, ActivityRow):
+                    description = activity.description
+                    activity_type = activity.type
+                    technologies = activity.technologies
+                else:
+                    description = activity.get("description", "No description")
+                    activity_type = activity.get("type", activity.get("activity_type", "activity"))
+                    technologies = activity.get("technologies", activity.get("tech", []))
+
+                # Format description with wiki-links if entities provided
+                if link_patterns:
+                    description = self._format_activity_with_links(description, link_patterns)
+
+                yield f"- **[{activity_type}]** {description}"
+
+                if include_technologies and technologies:
+                    yield f"  - Technologies: {', '.join(technologies)}"
+
+                yield ""
+
+    def _project_folder(self, project_name: str) -> Path:
+        """Get the kebab-case folder path for a project, without creating it."""
+        project_folder = self._project_folders.get(project_name)
+        if project_folder is None:
+            project_folder = self.project_vault / self._to_kebab_case(project_name)
+            self._project_folders[project_name] = project_folder
+        return project_folder
+
     def ensure_project_folder(self, project_name: str) -> Path:
         """
         Ensure a project folder exists in the project vault.
@@ -105,8 +244,7 @@ class ObsidianWriter:
         Returns:
             Path to the project folder
         """
-        folder_name = self._to_kebab_case(project_name)
-        project_folder = self.project_vault / folder_name
+        project_folder = self._project_folder(project_name)
         project_folder.mkdir(parents=True, exist_ok=True)
         logger.debug(f"Ensured project folder exists: {project_folder}")
         return project_folder
@@ -114,7 +252,7 @@ class ObsidianWriter:
     def write_activity_log(
         self,
         project_name: str,
-        activities: List[Dict[str, Any]],
+        activities: List[ActivityItem],
         entities: Optional[List[Entity]] = None,
     ) -> Path:
         """
@@ -122,7 +260,7 @@ class ObsidianWriter:
 
         Args:
             project_name: Name of the project
-            activities: List of activity dictionaries with date, description, technologies
+            activities: ActivityRow entries, or dictionaries with date, description, technologies
             entities: Optional list of entities for generating wiki-links and tags
 
         Returns:
@@ -133,17 +271,19 @@ class ObsidianWriter:
 
         # Build entity lookup map
         entity_map: Dict[str, Entity] = {}
-        tags: List[str] = []
+        # Insertion-ordered set of tags
+        tags: Dict[str, None] = {}
         if entities:
             for entity in entities:
-                entity_map[entity.name.lower()] = entity
-                if entity.display_name and entity.display_name.lower() != entity.name.lower():
-                    entity_map[entity.display_name.lower()] = entity
+                name_lower = entity.name.lower()
+                entity_map[name_lower] = entity
+                if entity.display_name:
+                    display_lower = entity.display_name.lower()
+                    if display_lower != name_lower:
+                        entity_map[display_lower] = entity
                 # Generate tags from entity types
-                if entity.entity_type in ("technology", "concept"):
-                    tag = entity.name.lower().replace(" ", "-").replace("_", "-")
-                    if tag not in tags:
-                        tags.append(tag)
+                if entity.entity_type in LINKED_ENTITY_TYPES:
+                    tags[name_lower.replace(" ", "-").replace("_", "-")] = None
 
         # Build the markdown content
         frontmatter_data: Dict[str, Any] = {
@@ -152,7 +292,7 @@ class ObsidianWriter:
             "type": "activity-log",
         }
         if tags:
-            frontmatter_data["tags"] = tags[:20]  # Limit to 20 tags
+            frontmatter_data["tags"] = list(tags)[:20]  # Limit to 20 tags
 
         lines = [
             self._format_frontmatter(frontmatter_data),
@@ -161,55 +301,48 @@ class ObsidianWriter:
             "",
         ]
 
-        # Group activities by date
-        activities_by_date: Dict[str, List[Dict[str, Any]]] = {}
-        for activity in activities:
-            date = activity.get("date", activity.get("timestamp", "")[:10])
-            if date:
-                if date not in activities_by_date:
-                    activities_by_date[date] = []
-                activities_by_date[date].append(activity)
-
-        # Sort dates in descending order
-        sorted_dates = sorted(activities_by_date.keys(), reverse=True)
-
-        for date in sorted_dates:
-            lines.append(f"## {date}")
-            lines.append("")
-
-            for activity in activities_by_date[date]:
-                description = activity.get("description", "No description")
-                activity_type = activity.get("type", activity.get("activity_type", "activity"))
-                technologies = activity.get("technologies", activity.get("tech", []))
-
-                # Format description with wiki-links if entities provided
-                if entity_map:
-                    description = self._format_activity_with_links(description, entity_map)
+        # Write the file, streaming the activity section
+        self._write_lines(
+            log_file,
+            chain(lines, self._iter_activity_lines(activities, entity_map, include_technologies=True)),
+        )
+        logger.info(f"Wrote activity log to {log_file} ({len(activities)} activities)")
 
-                lines.append(f"- **[{activity_type}]** {description}")
+        return log_file
 
-                if technologies:
-                    tech_str = ", ".join(technologies)
-                    lines.append(f"  - Technologies: {tech_str}")
+    def write_activity_logs(
+        self,
+        activities_by_project: Mapping[str, List[ActivityItem]],
+        entities_by_project: Optional[Mapping[str, List[Entity]]] = None,
+    ) -> List[Path]:
+        """
+        Write the activity logs for several projects in one pass.
 
-                lines.append("")
+        Each project's activity-log.md is built and replaced once, however
+        many of its activities are in the batch.
 
-        # Write the file
-        content = "\n".join(lines)
-        log_file.write_text(content, encoding="utf-8")
-        logger.info(f"Wrote activity log to {log_file} ({len(activities)} activities)")
+        Args:
+            activities_by_project: Activity dictionaries keyed by project name
+            entities_by_project: Optional entities keyed by project name
 
-        return log_file
+        Returns:
+            Paths to the created files, in project order
+        """
+        entities_by_project = entities_by_project or {}
+        return [
+            self.write_activity_log(project_name, activities, entities=entities_by_project.get(project_name))
+            for project_name, activities in activities_by_project.items()
+        ]
 
     def write_personal_activity_log(
         self,
-        activities: List[Dict[str, Any]],
+        activities: List[ActivityItem],
     ) -> Path:
         """
         Write personal activities to the personal vault.
 
         Args:
-            activities: List of activity dictionaries
+            activities: ActivityRow entries or activity dictionaries
 
         Returns:
             Path to the created file
@@ -228,32 +361,26 @@ class ObsidianWriter:
             "",
         ]
 
-        # Group by date
-        activities_by_date: Dict[str, List[Dict[str, Any]]] = {}
-        for activity in activities:
-            date = activity.get("date", activity.get("timestamp", "")[:10])
-            if date:
-                if date not in activities_by_date:
-                    activities_by_date[date] = []
-                activities_by_date[date].append(activity)
-
-        sorted_dates = sorted(activities_by_date.keys(), reverse=True)
+        self._write_lines(log_file, chain(lines, self._iter_activity_lines(activities)))
+        logger.info(f"Wrote personal activity log to {log_file}")
 
-        for date in sorted_dates:
-            lines.append(f"## {date}")
-            lines.append("")
+        return log_file
 
-            for activity in activities_by_date[date]:
-                description = activity.get("description", "No description")
-                activity_type = activity.get("type", activity.get("activity_type", "activity"))
-                lines.append(f"- **[{activity_type}]** {description}")
-                lines.append("")
+    def read_project_readme(self, project_name: str) -> str:
+        """
+        Read the project's README.md.
 
-        content = "\n".join(lines)
-        log_file.write_text(content, encoding="utf-8")
-        logger.info(f"Wrote personal activity log to {log_file}")
+        Args:
+            project_name: Name of the project
 
-        return log_file
+        Returns:
+            README contents, or an empty string if it doesn't exist yet
+        """
+        readme_file = self._project_folder(project_name) / "README.md"
+        try:
+            return readme_file.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return ""
 
     def update_project_readme(
         self,
@@ -279,19 +406,20 @@ class ObsidianWriter:
         entity_map: Dict[str, Entity] = {}
         technologies: List[Entity] = []
         concepts: List[Entity] = []
+        sections = {"technology": technologies, "concept": concepts}
 
         if entities:
             for entity in entities:
                 entity_map[entity.name.lower()] = entity
-                if entity.entity_type == "technology":
-                    technologies.append(entity)
-                elif entity.entity_type == "concept":
-                    concepts.append(entity)
+                section = sections.get(entity.entity_type)
+                if section is not None:
+                    section.append(entity)
 
-        # Create or read existing README
-        if readme_file.exists():
+        # Create or read existing README; a missing file is the rare case,
+        # so try the read rather than stat first
+        try:
             existing_content = readme_file.read_text(encoding="utf-8")
-        else:
+        except FileNotFoundError:
             # Create new README with frontmatter
             existing_content = self._format_frontmatter({
                 "project": project_name,
@@ -375,7 +503,7 @@ class ObsidianWriter:
             lines = lines[:insert_index] + weekly_section + lines[insert_index:]
             existing_content = "\n".join(lines)
 
-        readme_file.write_text(existing_content, encoding="utf-8")
+        self._write_file(readme_file, existing_content)
         logger.info(f"Updated README for {project_name} with weekly summary")
 
         return readme_file
@@ -398,7 +526,7 @@ class ObsidianWriter:
             Path to the created note file
         """
         # Only create notes for technology and concept types
-        if entity.entity_type not in ("technology", "concept"):
+        if entity.entity_type not in LINKED_ENTITY_TYPES:
             logger.debug(f"Skipping entity note for {entity.entity_type}: {entity.name}")
             return self.personal_vault / f"entities/{entity.name}.md"
 
@@ -478,7 +606,7 @@ class ObsidianWriter:
             lines.append("## Related")
             lines.append("")
             for related in related_entities:
-                if related.entity_type in ("technology", "concept"):
+                if related.entity_type in LINKED_ENTITY_TYPES:
                     related_safe_name = self._to_kebab_case(related.name)
                     if related.display_name and related.display_name != related.name:
                         lines.append(f"- [[entities/{related_safe_name}|{related.display_name}]] ({related.entity_type})")
@@ -493,7 +621,7 @@ class ObsidianWriter:
 
         # Write the file
         content = "\n".join(lines)
-        note_file.write_text(content, encoding="utf-8")
+        self._write_file(note_file, content)
         logger.info(f"Wrote entity note to {note_file}")
 
         return note_file
@@ -532,7 +660,7 @@ class ObsidianWriter:
         # Group tweets by date
         tweets_by_date: Dict[str, List[Dict[str, Any]]] = {}
         for tweet in tweets:
-            date = tweet.get("date", tweet.get("timestamp", "")[:10])
+            date = self._item_date(tweet)
             if not date:
                 date = datetime.now().strftime("%Y-%m-%d")
             
@@ -565,7 +693,7 @@ class ObsidianWriter:
                 lines.append("")
 
         content = "\n".join(lines)
-        drafts_file.write_text(content, encoding="utf-8")
+        self._write_file(drafts_file, content)
         logger.info(f"Wrote {len(tweets)} tweet drafts to {drafts_file}")
 
         return drafts_file